@@ -99,7 +99,7 @@ class ArxivDailyAgent(BaseAgent):
             
             # Step 3: Generate daily report
             self.logger.info("Generating daily report...")
-            report_data = self.report_generator.generate_daily_report(scored_papers, date)
+            report_data = await self.report_generator.agenerate_daily_report(scored_papers, date)
             
             # Calculate summary statistics
             priority_counts = {1: 0, 2: 0, 3: 0}
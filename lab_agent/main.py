@@ -3,6 +3,11 @@ import logging
 from typing import Optional
 from dotenv import load_dotenv
 
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - depends on the environment
+    uvloop = None
+
 from .utils import Config, setup_logger
 from .agents import BaseAgent
 
@@ -34,6 +39,10 @@ class LabAgent:
         
 
 def main():
+    # uvloop lowers per-await overhead when it is installed. Not used by the web app,
+    # whose nest_asyncio patching only works on the stdlib event loop.
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     agent = LabAgent()
     asyncio.run(agent.run())
 
@@ -6,7 +6,7 @@ import json
 import logging
 import os
 from typing import Dict, Any, List, Optional, Iterator, Union, AsyncIterator
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from ..utils import Config
 from .model_capabilities import get_model_caps, ModelCapabilities
 
@@ -22,8 +22,21 @@ class ResponsesClient:
             raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY in your .env file")
         
         self.client = OpenAI(api_key=self.config.openai_api_key)
+        self._async_client = None
+        # (tools key, API payload) for the last tools seen, reused across tool-loop iterations
+        self._tools_param_cache = (None, [])
+        # Last response each extractor walked, with its result: (response, value)
+        self._tool_calls_cache = (None, [])
+        self._text_cache = (None, "")
         self._load_playground_config()
     
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """Lazily created AsyncOpenAI client for the async tool loop"""
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(api_key=self.config.openai_api_key)
+        return self._async_client
+    
     def _load_playground_config(self) -> None:
         """Load playground-specific configuration"""
         config_path = os.path.join(
@@ -61,6 +74,51 @@ class ResponsesClient:
         # since it's more widely supported and stable
         return False
     
+    @staticmethod
+    def _api_messages(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Reduce messages to role/content pairs for the API
+        
+        Assistant turns with no text (tool-call-only turns) are skipped: tool_calls
+        are not forwarded here, so they would only add empty messages to the payload.
+        """
+        return [
+            {"role": msg["role"], "content": msg["content"]}
+            for msg in messages
+            if msg["content"] or msg["role"] != "assistant"
+        ]
+    
+    def _get_tools_param(self, tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Build the API ``tools`` payload, stripping routing metadata
+        
+        The payload is rebuilt only when a tool's name, description or schema object
+        changes. The cached payload holds the schemas, so their ids cannot be reused
+        while they are part of the key.
+        """
+        functions = [tool["function"] for tool in tools]
+        key = tuple(
+            (function["name"], function.get("description", ""), id(function.get("parameters")))
+            for function in functions
+        )
+        cached_key, cached_param = self._tools_param_cache
+        if cached_key == key:
+            return cached_param
+        
+        tools_param = [
+            {
+                "type": "function",
+                "function": {
+                    "name": function["name"],
+                    "description": function.get("description", ""),
+                    "parameters": function.get("parameters", {})
+                }
+            }
+            for function in functions
+        ]
+        self._tools_param_cache = (key, tools_param)
+        return tools_param
+    
     def _prepare_chat_params(
         self, 
         model: str,
@@ -77,24 +135,14 @@ class ResponsesClient:
         # Base parameters for Chat Completions
         params = {
             "model": model,
-            "messages": [{"role": msg["role"], "content": msg["content"]} for msg in messages],
+            "messages": self._api_messages(messages),
             "temperature": config.get("temperature", caps.defaults.temperature) if config else caps.defaults.temperature,
             "top_p": config.get("top_p", caps.defaults.top_p) if config else caps.defaults.top_p,
         }
         
         # Add tools if supported and provided
         if tools and caps.supports.tools:
-            params["tools"] = [
-                {
-                    "type": "function",
-                    "function": {
-                        "name": tool["function"]["name"],
-                        "description": tool["function"].get("description", ""),
-                        "parameters": tool["function"].get("parameters", {})
-                    }
-                }
-                for tool in tools
-            ]
+            params["tools"] = self._get_tools_param(tools)
             params["tool_choice"] = "auto"
         
         # Add reasoning effort for o-series models (Chat Completions supports this)
@@ -132,24 +180,14 @@ class ResponsesClient:
         # Base parameters for Responses API
         params = {
             "model": model,
-            "input": [{"role": msg["role"], "content": msg["content"]} for msg in messages],
+            "input": self._api_messages(messages),
             "temperature": config.get("temperature", caps.defaults.temperature) if config else caps.defaults.temperature,
             "top_p": config.get("top_p", caps.defaults.top_p) if config else caps.defaults.top_p,
         }
         
         # Add tools if supported and provided
         if tools and caps.supports.tools:
-            params["tools"] = [
-                {
-                    "type": "function",
-                    "function": {
-                        "name": tool["function"]["name"],
-                        "description": tool["function"].get("description", ""),
-                        "parameters": tool["function"].get("parameters", {})
-                    }
-                }
-                for tool in tools
-            ]
+            params["tools"] = self._get_tools_param(tools)
             params["tool_choice"] = "auto"
         
         # Add reasoning parameters if supported (Responses API format)
@@ -216,6 +254,38 @@ class ResponsesClient:
                 self.logger.error(f"Chat Completions API call failed: {e}")
                 raise
     
+    async def acreate_response(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> Any:
+        """Async counterpart of create_response (non-streaming) using AsyncOpenAI"""
+        use_responses_api = self._should_use_responses_api(model)
+        
+        if use_responses_api:
+            params = self._prepare_responses_params(model, messages, tools, config, **kwargs)
+            
+            self.logger.info(f"Making async Responses API call to {model} with {len(messages)} messages")
+            
+            try:
+                return await self.async_client.responses.create(**params)
+            except Exception as e:
+                self.logger.error(f"Async Responses API call failed: {e}")
+                raise
+        else:
+            params = self._prepare_chat_params(model, messages, tools, config, **kwargs)
+            
+            self.logger.info(f"Making async Chat Completions API call to {model} with {len(messages)} messages")
+            
+            try:
+                return await self.async_client.chat.completions.create(**params)
+            except Exception as e:
+                self.logger.error(f"Async Chat Completions API call failed: {e}")
+                raise
+    
     def stream_response(
         self,
         model: str,
@@ -261,16 +331,18 @@ class ResponsesClient:
             try:
                 stream = self.client.chat.completions.create(stream=True, **params)
                 
-                # Accumulate content and tool calls from streaming chunks
-                accumulated_content = ""
+                # Accumulate content and tool calls from streaming chunks; deltas are
+                # collected in lists and joined once instead of concatenated per chunk
+                content_parts = []
                 accumulated_tool_calls = {}
+                argument_parts = {}
                 
                 for chunk in stream:
                     # Convert chat completion chunk to simplified format
                     event = self._convert_chat_chunk(chunk)
                     
                     if event["type"] == "content_delta":
-                        accumulated_content += event.get("content", "")
+                        content_parts.append(event.get("content", ""))
                         yield event
                     elif event["type"] == "tool_calls":
                         # Accumulate tool calls (they come in pieces)
@@ -283,14 +355,17 @@ class ResponsesClient:
                                         "type": "function",
                                         "function": {"name": "", "arguments": ""}
                                     }
+                                    argument_parts[call_id] = []
                                 
                                 # Update accumulated tool call
                                 func = tool_call.get("function", {})
                                 if func.get("name"):
                                     accumulated_tool_calls[call_id]["function"]["name"] = func["name"]
                                 if func.get("arguments"):
-                                    accumulated_tool_calls[call_id]["function"]["arguments"] += func["arguments"]
+                                    argument_parts[call_id].append(func["arguments"])
                     elif event["type"] == "finish":
+                        for call_id, parts in argument_parts.items():
+                            accumulated_tool_calls[call_id]["function"]["arguments"] = "".join(parts)
                         if event.get("finish_reason") == "tool_calls" and accumulated_tool_calls:
                             # Send accumulated tool calls
                             yield {
@@ -302,10 +377,14 @@ class ResponsesClient:
                     else:
                         yield event
                 
+                # Streams may end without a finish chunk; make sure arguments are assembled
+                for call_id, parts in argument_parts.items():
+                    accumulated_tool_calls[call_id]["function"]["arguments"] = "".join(parts)
+                
                 # Mark as done
                 yield {
                     "type": "final_response",
-                    "final_content": accumulated_content,
+                    "final_content": "".join(content_parts),
                     "tool_calls": list(accumulated_tool_calls.values()) if accumulated_tool_calls else [],
                     "done": True
                 }
@@ -442,7 +521,11 @@ class ResponsesClient:
             return self.create_response(model, messages, tools, config, stream, **kwargs)
     
     def extract_tool_calls(self, response) -> List[Dict[str, Any]]:
-        """Extract tool calls from a response"""
+        """Extract tool calls from a response (repeat calls for the same response are cached)"""
+        cached_response, cached_tool_calls = self._tool_calls_cache
+        if cached_response is response and response is not None:
+            return cached_tool_calls
+        
         tool_calls = []
         
         try:
@@ -476,10 +559,21 @@ class ResponsesClient:
         except Exception as e:
             self.logger.warning(f"Failed to extract tool calls: {e}")
         
+        self._tool_calls_cache = (response, tool_calls)
         return tool_calls
     
     def extract_text_content(self, response) -> str:
-        """Extract text content from a response"""
+        """Extract text content from a response (repeat calls for the same response are cached)"""
+        cached_response, cached_text = self._text_cache
+        if cached_response is response and response is not None:
+            return cached_text
+        
+        text = self._extract_text_content(response)
+        self._text_cache = (response, text)
+        return text
+    
+    def _extract_text_content(self, response) -> str:
+        """Walk a response for its text content"""
         try:
             # Handle Responses API format
             if hasattr(response, 'output_text'):
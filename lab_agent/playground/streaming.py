@@ -4,10 +4,16 @@ Streaming Utilities - Helper functions for streaming responses and tool calls
 
 import json
 import time
-import streamlit as st
 from typing import Dict, Any, List, Optional, Iterator
 from datetime import datetime
 
+# Cursor animation frames (four entries so the index can be masked with ``& 3``)
+_CURSOR_TAILS = ("|", "/", "-", "\\")
+_EMPTY_TAIL = ""
+
+# Event types that end a streaming response
+_TERMINAL_TYPES = frozenset({"loop_complete", "final_response", "error", "loop_error"})
+
 
 class StreamingDisplay:
     """Utilities for displaying streaming responses in Streamlit"""
@@ -16,23 +22,25 @@ class StreamingDisplay:
         self.current_content = ""
         self.tool_calls = []
         self.reasoning_content = ""
-        self.cursor_states = ["|", "/", "-", "\\"]
+        self.cursor_states = _CURSOR_TAILS
         self.cursor_index = 0
     
     def get_cursor(self) -> str:
         """Get animated cursor for streaming display"""
-        cursor = self.cursor_states[self.cursor_index]
-        self.cursor_index = (self.cursor_index + 1) % len(self.cursor_states)
+        cursor = _CURSOR_TAILS[self.cursor_index & 3]
+        self.cursor_index += 1
         return cursor
     
     def format_streaming_content(self, content: str, show_cursor: bool = True) -> str:
         """Format content for streaming display with cursor"""
-        if show_cursor:
-            return content + self.get_cursor()
-        return content
+        tail = _CURSOR_TAILS[self.cursor_index & 3] if show_cursor else _EMPTY_TAIL
+        self.cursor_index += 1
+        return content + tail
     
     def display_tool_call_start(self, tool_name: str, arguments: Dict[str, Any]) -> None:
         """Display tool call initiation"""
+        import streamlit as st
+        
         with st.container():
             st.info(f"🔧 Calling tool: **{tool_name}**")
             with st.expander("View arguments", expanded=False):
@@ -40,10 +48,14 @@ class StreamingDisplay:
     
     def display_tool_call_progress(self, tool_name: str, message: str = "Executing...") -> None:
         """Display tool call progress"""
+        import streamlit as st
+        
         st.info(f"⚡ {tool_name}: {message}")
     
     def display_tool_call_result(self, tool_name: str, result: Dict[str, Any], success: bool = True) -> None:
         """Display tool call result"""
+        import streamlit as st
+        
         if success:
             st.success(f"✅ {tool_name} completed successfully")
         else:
@@ -58,6 +70,8 @@ class StreamingDisplay:
     
     def display_reasoning_item(self, reasoning: Dict[str, Any]) -> None:
         """Display reasoning content for reasoning models"""
+        import streamlit as st
+        
         reasoning_type = reasoning.get("type", "unknown")
         
         if reasoning_type == "reasoning":
@@ -85,6 +99,8 @@ class StreamingEventProcessor:
     
     def setup_placeholders(self):
         """Setup Streamlit placeholders for different content types"""
+        import streamlit as st
+        
         self.message_placeholder = st.empty()
         self.tool_placeholder = st.empty()
         self.reasoning_placeholder = st.empty()
@@ -210,6 +226,8 @@ class StreamingEventProcessor:
     
     def _handle_error(self, event: Dict[str, Any]) -> bool:
         """Handle error events"""
+        import streamlit as st
+        
         error_msg = event.get("error", "Unknown error occurred")
         
         st.error(f"❌ Error: {error_msg}")
@@ -224,6 +242,8 @@ class StreamingEventProcessor:
     
     def _handle_loop_error(self, event: Dict[str, Any]) -> bool:
         """Handle tool loop error events"""
+        import streamlit as st
+        
         error_msg = event.get("error", "Tool loop error occurred")
         loop_count = event.get("loop_count", "unknown")
         
@@ -254,6 +274,8 @@ def create_streaming_chat_response(
     Returns:
         Final response data
     """
+    import streamlit as st
+    
     processor = StreamingEventProcessor()
     
     # Setup display areas
@@ -282,19 +304,7 @@ def create_streaming_chat_response(
             handled = processor.process_event(event)
             
             # Store final data
-            if event.get("type") == "loop_complete":
-                final_data = event
-                break
-            elif event.get("type") == "final_response":
-                final_data = event
-                break
-            elif event.get("type") == "error":
-                final_data = event
-                break
-            elif event.get("type") == "loop_error":
-                final_data = event
-                break
-            elif event.get("done", False):
+            if event.get("type") in _TERMINAL_TYPES or event.get("done"):
                 final_data = event
                 break
             
@@ -50,7 +50,7 @@ class ToolAdapter:
     
     def _convert_parameters(self, mcp_parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Convert MCP parameter schema to OpenAI format"""
-        if not mcp_parameters:
+        if not mcp_parameters or not isinstance(mcp_parameters, dict):
             return {
                 "type": "object",
                 "properties": {},
@@ -58,24 +58,16 @@ class ToolAdapter:
             }
         
         # If it's already in JSON Schema format, use as-is
-        if isinstance(mcp_parameters, dict) and "type" in mcp_parameters:
+        if "type" in mcp_parameters:
             return mcp_parameters
         
-        # Otherwise, try to convert
-        try:
-            return {
-                "type": "object",
-                "properties": mcp_parameters.get("properties", {}),
-                "required": mcp_parameters.get("required", []),
-                "description": mcp_parameters.get("description", "")
-            }
-        except Exception as e:
-            self.logger.warning(f"Parameter conversion failed, using default: {e}")
-            return {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
+        # Otherwise, convert
+        return {
+            "type": "object",
+            "properties": mcp_parameters.get("properties", {}),
+            "required": mcp_parameters.get("required", []),
+            "description": mcp_parameters.get("description", "")
+        }
     
     def _create_error_tool(self, error_msg: str) -> Dict[str, Any]:
         """Create an error tool when conversion fails"""
@@ -199,26 +191,22 @@ class ToolAdapter:
     
     def validate_tool_definition(self, tool: Dict[str, Any]) -> bool:
         """Validate that a tool definition is properly formatted"""
-        try:
-            # Check required fields
-            if not isinstance(tool, dict):
-                return False
-            
-            if tool.get("type") != "function":
-                return False
-            
-            function = tool.get("function", {})
-            if not function.get("name"):
-                return False
-            
-            parameters = function.get("parameters", {})
-            if not isinstance(parameters, dict):
-                return False
-            
-            return True
-            
-        except Exception:
+        # Check required fields
+        if not isinstance(tool, dict):
             return False
+        
+        if tool.get("type") != "function":
+            return False
+        
+        function = tool.get("function", {})
+        if not function.get("name"):
+            return False
+        
+        parameters = function.get("parameters", {})
+        if not isinstance(parameters, dict):
+            return False
+        
+        return True
     
     def get_tool_signature(self, tool: Dict[str, Any]) -> str:
         """Get a human-readable signature for a tool"""
@@ -2,14 +2,25 @@
 Tool Loop - Recursive tool calling until completion
 """
 
+import copy
+import hashlib
 import json
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional, Callable, Union, Iterator
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Any, List, NamedTuple, Optional, Callable, Tuple, Union, Iterator
+from ..utils import fast_json
 from .responses_client import ResponsesClient
 from .tool_adapter import ToolAdapter
 
 
+class CachedToolResult(NamedTuple):
+    """Tool result dict paired with its JSON serialization for the conversation"""
+    result: Dict[str, Any]
+    result_json: str
+
+
 class ToolLoop:
     """Handles recursive tool calling until model stops requesting tools"""
     
@@ -19,6 +30,16 @@ class ToolLoop:
         self.tool_adapter = tool_adapter or ToolAdapter()
         self.max_recursive_calls = 10
         self.tool_timeout = 30
+        self.max_parallel_tools = 8
+        # Messages sent per API call: once the conversation exceeds context_window,
+        # everything between the leading system messages and the last keep_tail
+        # messages is condensed into a single system message
+        self.context_window = 40
+        self.keep_tail = 20
+        self.condensed_content_chars = 200
+        # Results of successful calls to tools flagged "memoizable", keyed by (name, sha256(args))
+        self._memo: Dict[Tuple[str, str], CachedToolResult] = {}
+        self._memo_lock = threading.Lock()
     
     def execute_tool_loop(
         self,
@@ -45,27 +66,28 @@ class ToolLoop:
         config: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Execute tool loop in blocking mode"""
-        self.logger.info(f"Starting tool loop for {model} with {len(tools)} tools available")
+        self.logger.info("Starting tool loop for %s with %d tools available", model, len(tools))
         
         loop_count = 0
         conversation_messages = messages.copy()
         tool_call_history = []
+        tool_index = self._build_tool_index(tools)
         
         while loop_count < self.max_recursive_calls:
             loop_count += 1
-            self.logger.info(f"Tool loop iteration {loop_count}")
+            self.logger.info("Tool loop iteration %d", loop_count)
             
             # Make API call
             try:
                 response = self.responses_client.create_response(
                     model=model,
-                    messages=conversation_messages,
+                    messages=self._window_messages(conversation_messages),
                     tools=tools,
                     config=config,
                     stream=False
                 )
             except Exception as e:
-                self.logger.error(f"API call failed in loop {loop_count}: {e}")
+                self.logger.error("API call failed in loop %d: %s", loop_count, e)
                 return {
                     "success": False,
                     "error": f"API call failed: {e}",
@@ -85,7 +107,7 @@ class ToolLoop:
             
             # If no tool calls, we're done
             if not tool_calls:
-                self.logger.info(f"Tool loop completed after {loop_count} iterations")
+                self.logger.info("Tool loop completed after %d iterations", loop_count)
                 return {
                     "success": True,
                     "response": response,
@@ -95,56 +117,233 @@ class ToolLoop:
                     "conversation": conversation_messages
                 }
             
-            # Execute tool calls
+            # Execute tool calls concurrently; results are consumed in call order
             tool_outputs = []
-            for tool_call in tool_calls:
-                try:
-                    result = self._execute_single_tool(tool_call, tool_executor, tools)
-                    tool_output = self.tool_adapter.format_tool_result(result, tool_call["id"])
-                    tool_outputs.append(tool_output)
-                    
-                    # Record in history
-                    tool_call_history.append({
-                        "call": tool_call,
-                        "result": result,
-                        "iteration": loop_count
-                    })
-                    
-                    # Add tool result to conversation
-                    conversation_messages.append({
-                        "role": "tool",
-                        "content": json.dumps(result),
-                        "tool_call_id": tool_call["id"]
-                    })
-                    
-                except Exception as e:
-                    error_result = {"success": False, "error": str(e)}
-                    tool_output = self.tool_adapter.format_tool_result(error_result, tool_call["id"])
-                    tool_outputs.append(tool_output)
-                    
-                    tool_call_history.append({
-                        "call": tool_call,
-                        "result": error_result,
-                        "iteration": loop_count,
-                        "error": str(e)
-                    })
+            history_entries = []
+            tool_messages = []
+            executor = ThreadPoolExecutor(max_workers=min(len(tool_calls), self.max_parallel_tools))
+            futures = []
+            try:
+                futures = [
+                    executor.submit(self._execute_single_tool, tool_call, tool_executor, tool_index)
+                    for tool_call in tool_calls
+                ]
+                # One deadline for the whole batch, so waiting on earlier tools does not
+                # extend the time later ones are given
+                done, _ = wait(futures, timeout=self.tool_timeout)
+                
+                for tool_call, future in zip(tool_calls, futures):
+                    if future not in done:
+                        tool_result, error = None, f"Tool execution timed out after {self.tool_timeout} seconds"
+                    else:
+                        try:
+                            tool_result = future.result()
+                            error = None
+                        except Exception as e:
+                            tool_result, error = None, str(e)
                     
-                    conversation_messages.append({
-                        "role": "tool",
-                        "content": json.dumps(error_result),
-                        "tool_call_id": tool_call["id"]
-                    })
+                    self._record_tool_result(
+                        tool_call, tool_result, error, loop_count,
+                        tool_outputs, history_entries, tool_messages
+                    )
+            finally:
+                # Drop queued tools that never started (cancel_futures needs Python 3.9),
+                # and don't block on running tools that overran the deadline
+                for future in futures:
+                    future.cancel()
+                executor.shutdown(wait=False)
+            
+            tool_call_history.extend(history_entries)
+            conversation_messages.extend(tool_messages)
+            
+            # No further model call is allowed, so a continuation prompt would go unused
+            if loop_count >= self.max_recursive_calls:
+                break
             
             # After all tool calls are executed, add user continuation prompt
             # This is critical for Chat Completions API - the model needs a user prompt to continue
-            self.logger.info(f"Adding user continuation prompt after {len(tool_calls)} tool calls")
+            self.logger.info("Adding user continuation prompt after %d tool calls", len(tool_calls))
             conversation_messages.append({
                 "role": "user", 
                 "content": "Continue with the analysis based on the tool results above."
             })
         
         # Max iterations reached
-        self.logger.warning(f"Tool loop reached max iterations ({self.max_recursive_calls})")
+        self.logger.warning("Tool loop reached max iterations (%d)", self.max_recursive_calls)
+        return {
+            "success": False,
+            "error": f"Maximum recursion depth reached ({self.max_recursive_calls})",
+            "loop_count": loop_count,
+            "tool_calls": tool_call_history,
+            "conversation": conversation_messages
+        }
+    
+    @staticmethod
+    def _build_tool_index(tools: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Map tool names to their definitions (first definition wins)"""
+        tool_index = {}
+        for tool in tools:
+            tool_index.setdefault(tool["function"]["name"], tool)
+        return tool_index
+    
+    def _window_messages(self, conversation_messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return the bounded view of the conversation that is sent to the model"""
+        if len(conversation_messages) <= self.context_window:
+            return conversation_messages
+        
+        head_end = 0
+        while head_end < len(conversation_messages) and conversation_messages[head_end]["role"] == "system":
+            head_end += 1
+        
+        tail_start = max(head_end, len(conversation_messages) - self.keep_tail)
+        # Don't start the tail with tool results cut off from their assistant turn
+        while tail_start > head_end and conversation_messages[tail_start]["role"] == "tool":
+            tail_start -= 1
+        
+        condensed = conversation_messages[head_end:tail_start]
+        if not condensed:
+            return conversation_messages
+        
+        limit = self.condensed_content_chars
+        lines = []
+        for msg in condensed:
+            content = str(msg.get("content") or "")
+            if len(content) > limit:
+                content = content[:limit] + "..."
+            lines.append(f"[{msg['role']}] {content}")
+        
+        summary_msg = {
+            "role": "system",
+            "content": f"Earlier conversation ({len(condensed)} messages, condensed):\n" + "\n".join(lines)
+        }
+        return conversation_messages[:head_end] + [summary_msg] + conversation_messages[tail_start:]
+    
+    def _record_tool_result(
+        self,
+        tool_call: Dict[str, Any],
+        tool_result: Optional[CachedToolResult],
+        error: Optional[str],
+        loop_count: int,
+        tool_outputs: List[Dict[str, Any]],
+        history_entries: List[Dict[str, Any]],
+        tool_messages: List[Dict[str, Any]]
+    ) -> None:
+        """Collect a finished tool call's output, history entry and conversation message"""
+        history_entry = {"call": tool_call, "iteration": loop_count}
+        if error is not None:
+            tool_result = self._make_tool_result({"success": False, "error": error})
+            history_entry["error"] = error
+        history_entry["result"] = tool_result.result
+        
+        tool_outputs.append(self.tool_adapter.format_tool_result(tool_result.result, tool_call["id"]))
+        history_entries.append(history_entry)
+        tool_messages.append({
+            "role": "tool",
+            "content": tool_result.result_json,
+            "tool_call_id": tool_call["id"]
+        })
+    
+    async def execute_tool_loop_async(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]],
+        tool_executor: Callable[[str, Dict[str, Any]], Any],
+        config: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute the tool loop on the event loop (non-streaming)
+        
+        Model calls go through AsyncOpenAI and the tool calls of one iteration run
+        concurrently in the default executor, so blocking tool executors don't
+        stall the event loop. Returns the same result dict as the blocking loop.
+        """
+        self.logger.info("Starting async tool loop for %s with %d tools available", model, len(tools))
+        
+        loop = asyncio.get_running_loop()
+        loop_count = 0
+        conversation_messages = messages.copy()
+        tool_call_history = []
+        tool_index = self._build_tool_index(tools)
+        
+        async def run_tool(tool_call: Dict[str, Any]) -> Dict[str, Any]:
+            return await asyncio.wait_for(
+                loop.run_in_executor(None, self._execute_single_tool, tool_call, tool_executor, tool_index),
+                timeout=self.tool_timeout
+            )
+        
+        while loop_count < self.max_recursive_calls:
+            loop_count += 1
+            self.logger.info("Async tool loop iteration %d", loop_count)
+            
+            try:
+                response = await self.responses_client.acreate_response(
+                    model=model,
+                    messages=self._window_messages(conversation_messages),
+                    tools=tools,
+                    config=config
+                )
+            except Exception as e:
+                self.logger.error("API call failed in loop %d: %s", loop_count, e)
+                return {
+                    "success": False,
+                    "error": f"API call failed: {e}",
+                    "loop_count": loop_count,
+                    "tool_calls": tool_call_history
+                }
+            
+            tool_calls = self.responses_client.extract_tool_calls(response)
+            text_content = self.responses_client.extract_text_content(response)
+            
+            assistant_msg = {"role": "assistant", "content": text_content}
+            if tool_calls:
+                assistant_msg["tool_calls"] = tool_calls
+            conversation_messages.append(assistant_msg)
+            
+            if not tool_calls:
+                self.logger.info("Async tool loop completed after %d iterations", loop_count)
+                return {
+                    "success": True,
+                    "response": response,
+                    "final_content": text_content,
+                    "loop_count": loop_count,
+                    "tool_calls": tool_call_history,
+                    "conversation": conversation_messages
+                }
+            
+            results = await asyncio.gather(
+                *(run_tool(tool_call) for tool_call in tool_calls),
+                return_exceptions=True
+            )
+            
+            tool_outputs = []
+            history_entries = []
+            tool_messages = []
+            for tool_call, tool_result in zip(tool_calls, results):
+                if isinstance(tool_result, asyncio.TimeoutError):
+                    tool_result, error = None, f"Tool execution timed out after {self.tool_timeout} seconds"
+                elif isinstance(tool_result, BaseException):
+                    tool_result, error = None, str(tool_result)
+                else:
+                    error = None
+                
+                self._record_tool_result(
+                    tool_call, tool_result, error, loop_count,
+                    tool_outputs, history_entries, tool_messages
+                )
+            
+            tool_call_history.extend(history_entries)
+            conversation_messages.extend(tool_messages)
+            
+            if loop_count >= self.max_recursive_calls:
+                break
+            
+            conversation_messages.append({
+                "role": "user",
+                "content": "Continue with the analysis based on the tool results above."
+            })
+        
+        self.logger.warning("Async tool loop reached max iterations (%d)", self.max_recursive_calls)
         return {
             "success": False,
             "error": f"Maximum recursion depth reached ({self.max_recursive_calls})",
@@ -162,11 +361,12 @@ class ToolLoop:
         config: Optional[Dict[str, Any]] = None
     ) -> Iterator[Dict[str, Any]]:
         """Execute tool loop in streaming mode"""
-        self.logger.info(f"Starting streaming tool loop for {model}")
+        self.logger.info("Starting streaming tool loop for %s", model)
         
         loop_count = 0
         conversation_messages = messages.copy()
         tool_call_history = []
+        tool_index = self._build_tool_index(tools)
         
         while loop_count < self.max_recursive_calls:
             loop_count += 1
@@ -178,12 +378,12 @@ class ToolLoop:
             
             # Stream the response
             current_tool_calls = []
-            current_content = ""
+            content_parts = []
             
             try:
                 for event in self.responses_client.stream_response(
                     model=model,
-                    messages=conversation_messages,
+                    messages=self._window_messages(conversation_messages),
                     tools=tools,
                     config=config
                 ):
@@ -194,13 +394,13 @@ class ToolLoop:
                     if event.get("type") == "tool_calls":
                         current_tool_calls = event.get("tool_calls", [])
                     elif event.get("type") == "content_delta":
-                        current_content += event.get("content", "")
+                        content_parts.append(event.get("content", ""))
                     elif event.get("type") == "final_response":
                         # Extract final information
                         response = event.get("response")
                         if response:
                             current_tool_calls = self.responses_client.extract_tool_calls(response)
-                            current_content = self.responses_client.extract_text_content(response)
+                            content_parts = [self.responses_client.extract_text_content(response)]
                 
             except Exception as e:
                 yield {
@@ -211,6 +411,7 @@ class ToolLoop:
                 return
             
             # Add assistant response to conversation
+            current_content = "".join(content_parts)
             assistant_msg = {"role": "assistant", "content": current_content}
             if current_tool_calls:
                 assistant_msg["tool_calls"] = current_tool_calls
@@ -243,7 +444,8 @@ class ToolLoop:
                 }
                 
                 try:
-                    result = self._execute_single_tool(tool_call, tool_executor, tools)
+                    tool_result = self._execute_single_tool(tool_call, tool_executor, tool_index)
+                    result = tool_result.result
                     
                     tool_call_history.append({
                         "call": tool_call,
@@ -253,7 +455,7 @@ class ToolLoop:
                     
                     conversation_messages.append({
                         "role": "tool",
-                        "content": json.dumps(result),
+                        "content": tool_result.result_json,
                         "tool_call_id": tool_call["id"]
                     })
                     
@@ -276,7 +478,7 @@ class ToolLoop:
                     
                     conversation_messages.append({
                         "role": "tool",
-                        "content": json.dumps(error_result),
+                        "content": fast_json.dumps(error_result),
                         "tool_call_id": tool_call["id"]
                     })
                     
@@ -288,6 +490,10 @@ class ToolLoop:
                         "error": str(e)
                     }
             
+            # No further model call is allowed, so a continuation prompt would go unused
+            if loop_count >= self.max_recursive_calls:
+                break
+            
             # After all tool calls are executed, add user continuation prompt
             # This is critical for Chat Completions API - the model needs a user prompt to continue
             yield {
@@ -314,40 +520,50 @@ class ToolLoop:
         self,
         tool_call: Dict[str, Any],
         tool_executor: Callable[[str, Dict[str, Any]], Any],
-        available_tools: List[Dict[str, Any]]
-    ) -> Dict[str, Any]:
-        """Execute a single tool call"""
+        tool_index: Dict[str, Dict[str, Any]]
+    ) -> CachedToolResult:
+        """Execute a single tool call, resolving its definition from a name -> tool index"""
         tool_name = tool_call["function"]["name"]
         
         try:
             # Parse arguments
             if isinstance(tool_call["function"]["arguments"], str):
-                arguments = json.loads(tool_call["function"]["arguments"])
+                arguments = fast_json.loads(tool_call["function"]["arguments"])
             else:
                 arguments = tool_call["function"]["arguments"]
         except json.JSONDecodeError as e:
-            return {
+            return self._make_tool_result({
                 "success": False,
                 "error": f"Invalid tool arguments JSON: {e}",
                 "tool_name": tool_name
-            }
+            })
         
         # Find the tool definition for routing info
-        tool_def = None
-        for tool in available_tools:
-            if tool["function"]["name"] == tool_name:
-                tool_def = tool
-                break
+        tool_def = tool_index.get(tool_name)
         
         if not tool_def:
-            return {
+            return self._make_tool_result({
                 "success": False,
                 "error": f"Tool '{tool_name}' not found in available tools",
                 "tool_name": tool_name
-            }
+            })
+        
+        # Serve repeated calls of memoizable tools from the cache
+        memo_key = None
+        if tool_def["function"].get("memoizable"):
+            args_digest = hashlib.sha256(
+                fast_json.dumps(arguments, sort_keys=True, default=str).encode("utf-8")
+            ).hexdigest()
+            memo_key = (tool_name, args_digest)
+            with self._memo_lock:
+                cached = self._memo.get(memo_key)
+            if cached is not None:
+                self.logger.info("Using memoized result for tool: %s", tool_name)
+                return CachedToolResult(copy.deepcopy(cached.result), cached.result_json)
         
         # Execute the tool
-        self.logger.info(f"Executing tool: {tool_name} with args: {arguments}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Executing tool: %s with args: %s", tool_name, repr(arguments)[:200])
         
         try:
             result = tool_executor(tool_name, arguments, tool_def)
@@ -358,21 +574,48 @@ class ToolLoop:
             elif "success" not in result:
                 result["success"] = True
             
-            return result
+            tool_result = self._make_tool_result(result)
+            if memo_key is not None and result.get("success") is True:
+                with self._memo_lock:
+                    self._memo[memo_key] = CachedToolResult(copy.deepcopy(result), tool_result.result_json)
+            
+            return tool_result
             
         except Exception as e:
-            self.logger.error(f"Tool execution failed for {tool_name}: {e}")
-            return {
+            self.logger.error("Tool execution failed for %s: %s", tool_name, e)
+            return self._make_tool_result({
                 "success": False,
                 "error": str(e),
                 "tool_name": tool_name
-            }
+            })
+    
+    @staticmethod
+    def _make_tool_result(result: Dict[str, Any]) -> CachedToolResult:
+        """Serialize a tool result once for reuse in conversation messages"""
+        return CachedToolResult(result, fast_json.dumps(result, default=str))
+    
+    def clear_memo_cache(self):
+        """Drop all memoized tool results"""
+        with self._memo_lock:
+            self._memo.clear()
     
     def set_max_iterations(self, max_iterations: int):
         """Set maximum number of tool loop iterations"""
         self.max_recursive_calls = max_iterations
         self.logger.info(f"Max tool loop iterations set to {max_iterations}")
     
+    def set_context_window(self, context_window: int, keep_tail: int = None):
+        """Set how many messages are sent per API call before older ones are condensed"""
+        self.context_window = context_window
+        if keep_tail is not None:
+            self.keep_tail = keep_tail
+        self.logger.info(f"Context window set to {self.context_window} messages (keeping last {self.keep_tail})")
+    
+    def set_max_parallel_tools(self, max_parallel_tools: int):
+        """Set maximum number of tool calls executed concurrently per iteration"""
+        self.max_parallel_tools = max(1, max_parallel_tools)
+        self.logger.info(f"Max parallel tool calls set to {self.max_parallel_tools}")
+    
     def set_tool_timeout(self, timeout: int):
         """Set timeout for individual tool executions"""
         self.tool_timeout = timeout
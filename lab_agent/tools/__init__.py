@@ -1,23 +1,48 @@
 """
 Tool modules for agent capabilities.
+
+Tools are imported lazily on first attribute access (PEP 562), so importing one
+tool does not pull in the scraping and LLM client dependencies of all the others.
 """
 
-from .web_scraper import WebScraper
-from .arxiv_parser import ArxivParser
-from .arxiv_daily_scraper import ArxivDailyScraper
-from .paper_scorer import PaperScorer
-from .daily_report_generator import DailyReportGenerator
-from .arxiv_chat import ArxivChat
-from .llm_client import LLMClient
-from .llm_chatbox import LLMChatbox
+import importlib
+
+_LAZY_IMPORTS = {
+    "WebScraper": ".web_scraper",
+    "ArxivParser": ".arxiv_parser",
+    "ArxivDailyScraper": ".arxiv_daily_scraper",
+    "PaperScorer": ".paper_scorer",
+    "DailyReportGenerator": ".daily_report_generator",
+    "ArxivChat": ".arxiv_chat",
+    "LLMClient": ".llm_client",
+    "get_llm_client": ".llm_client",
+    "aget_llm_client": ".llm_client",
+    "LLMChatbox": ".llm_chatbox",
+}
 
 __all__ = [
-    "WebScraper", 
-    "ArxivParser", 
-    "ArxivDailyScraper", 
-    "PaperScorer", 
+    "WebScraper",
+    "ArxivParser",
+    "ArxivDailyScraper",
+    "PaperScorer",
     "DailyReportGenerator",
     "ArxivChat",
     "LLMClient",
+    "get_llm_client",
+    "aget_llm_client",
     "LLMChatbox"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
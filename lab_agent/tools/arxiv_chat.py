@@ -1,13 +1,27 @@
-import json
+import functools
 import logging
 import os
-from typing import List, Dict, Optional
+import threading
+from collections import Counter
+from typing import Any, Callable, List, Dict, Optional, Tuple
+import httpx
 from openai import OpenAI
-from ..utils import Config
-from .llm_client import LLMClient
+from ..utils import Config, fast_json
+from .llm_client import get_llm_client
+
+
+PRIORITY_NAMES = {3: "High Priority", 2: "Medium Priority", 1: "Lower Priority"}
+# Paper scores (as stored, int or str) -> priority bucket index
+_SCORE_BUCKETS = {3: 3, 2: 2, 1: 1, "3": 3, "2": 2, "1": 1}
+
+# Bounds in-flight model calls across all ArxivChat sessions
+_CONCURRENCY = threading.Semaphore(32)
 
 
 class ArxivChat:
+    # Parsed config files shared by all instances: path -> (mtime, value)
+    _file_cache: Dict[str, Tuple[float, Any]] = {}
+    
     def __init__(self):
         self.logger = logging.getLogger("tools.arxiv_chat")
         self.config = Config()
@@ -15,7 +29,7 @@ class ArxivChat:
         if not self.config.openai_api_key:
             raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY in your .env file")
         
-        self.client = OpenAI(api_key=self.config.openai_api_key)
+        self.client = self._shared_client(self.config.openai_api_key)
         self.system_prompt = self._load_system_prompt()
         self.model_config = self._load_model_config()
         self.conversation_history = []
@@ -23,10 +37,34 @@ class ArxivChat:
         
         # Initialize GPT-5 client if needed  
         if self.model_config.get('name') == 'gpt-5':
-            self.llm_client = LLMClient()
+            self.llm_client = get_llm_client()
         else:
             self.llm_client = None
         
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _shared_client(api_key: str) -> OpenAI:
+        """OpenAI client with a pooled HTTP connection, shared by all sessions using the same key"""
+        return OpenAI(
+            api_key=api_key,
+            http_client=httpx.Client(
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+            )
+        )
+    
+    @classmethod
+    def _read_cached(cls, path: str, parse: Callable[[bytes], Any]) -> Any:
+        """Read and parse a file once, re-reading only when its mtime changes"""
+        mtime = os.path.getmtime(path)
+        cached = cls._file_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        with open(path, 'rb') as f:
+            value = parse(f.read())
+        cls._file_cache[path] = (mtime, value)
+        return value
+    
     def _load_system_prompt(self) -> str:
         prompt_path = os.path.join(
             os.path.dirname(os.path.dirname(__file__)), 
@@ -35,8 +73,7 @@ class ArxivChat:
         )
         
         try:
-            with open(prompt_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            return self._read_cached(prompt_path, lambda data: data.decode('utf-8'))
         except FileNotFoundError:
             self.logger.error(f"Chat prompt template not found at {prompt_path}")
             return self._default_prompt()
@@ -49,13 +86,12 @@ class ArxivChat:
         )
         
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                return config.get('chatModel', {
-                    'name': 'gpt-4o',
-                    'maxTokens': 1500,
-                    'temperature': 0.3
-                })
+            config = self._read_cached(config_path, fast_json.loads)
+            return config.get('chatModel', {
+                'name': 'gpt-4o',
+                'maxTokens': 1500,
+                'temperature': 0.3
+            })
         except FileNotFoundError:
             self.logger.error(f"Model config not found at {config_path}")
             return {
@@ -72,7 +108,7 @@ class ArxivChat:
     def set_papers_context(self, papers: List[Dict]) -> None:
         """Set the context of today's papers for the chat session"""
         self.current_papers = papers
-        self.logger.info(f"Set context with {len(papers)} papers")
+        self.logger.info("Set context with %d papers", len(papers))
         
         # Clear conversation history when new papers are set
         self.conversation_history = []
@@ -92,46 +128,36 @@ class ArxivChat:
         if not papers:
             return "No papers available for today."
         
-        # Group papers by priority
-        priority_groups = {"3": [], "2": [], "1": []}
+        # Bucket papers by priority score (index 0 unused)
+        buckets = [None, [], [], []]
         for paper in papers:
-            score = str(paper.get('score', 1))
-            if score in priority_groups:
-                priority_groups[score].append(paper)
+            bucket = _SCORE_BUCKETS.get(paper.get('score', 1))
+            if bucket is not None:
+                buckets[bucket].append(paper)
         
-        summary_parts = []
+        summary_parts = [f"Today's arXiv cond-mat collection: {len(papers)} papers total"]
         
-        for priority, priority_papers in priority_groups.items():
+        for priority in (3, 2, 1):
+            priority_papers = buckets[priority]
             if not priority_papers:
                 continue
                 
-            priority_name = {
-                "3": "High Priority",
-                "2": "Medium Priority", 
-                "1": "Lower Priority"
-            }[priority]
+            priority_name = PRIORITY_NAMES[priority]
             
             summary_parts.append(f"\n### {priority_name} Papers ({len(priority_papers)} papers):")
             
-            for i, paper in enumerate(priority_papers[:5]):  # Show first 5 per priority
-                title = paper.get('title', 'No title')
-                authors = paper.get('authors', 'No authors')
-                abstract = paper.get('abstract', 'No abstract')[:200] + "..."
-                reason = paper.get('reason', 'No AI assessment')
-                
-                summary_parts.append(f"""
-**{i+1}. {title}**
-- Authors: {authors}
-- Abstract: {abstract}
-- AI Assessment: {reason}
-""")
+            for i, paper in enumerate(priority_papers[:5], 1):  # Show first 5 per priority
+                get = paper.get
+                summary_parts.append(
+                    f"\n**{i}. {get('title', 'No title')}**\n"
+                    f"- Authors: {get('authors', 'No authors')}\n"
+                    f"- Abstract: {get('abstract', 'No abstract')[:200]}...\n"
+                    f"- AI Assessment: {get('reason', 'No AI assessment')}\n"
+                )
                 
             if len(priority_papers) > 5:
                 summary_parts.append(f"... and {len(priority_papers) - 5} more papers in this priority level.")
         
-        total_papers = len(papers)
-        summary_parts.insert(0, f"Today's arXiv cond-mat collection: {total_papers} papers total")
-        
         return "\n".join(summary_parts)
     
     def chat(self, user_message: str) -> Dict[str, str]:
@@ -146,11 +172,12 @@ class ArxivChat:
             # Call appropriate API based on model
             if self.llm_client:
                 # Use GPT-5 responses API
-                result = self.llm_client.create_response(
-                    messages=self.conversation_history,
-                    use_case=self.model_config.get('purpose', 'chat_conversation'),
-                    model=self.model_config.get('name', 'gpt-5')
-                )
+                with _CONCURRENCY:
+                    result = self.llm_client.create_response(
+                        messages=self.conversation_history,
+                        use_case=self.model_config.get('purpose', 'chat_conversation'),
+                        model=self.model_config.get('name', 'gpt-5')
+                    )
                 
                 if not result['success']:
                     raise Exception(result.get('error', 'Unknown GPT-5 API error'))
@@ -158,12 +185,13 @@ class ArxivChat:
                 assistant_message = result['content']
             else:
                 # Use traditional chat completions API for GPT-4o
-                response = self.client.chat.completions.create(
-                    model=self.model_config.get('name', 'gpt-4o'),
-                    messages=self.conversation_history,
-                    max_tokens=self.model_config.get('maxTokens', 1500),
-                    temperature=self.model_config.get('temperature', 0.3)
-                )
+                with _CONCURRENCY:
+                    response = self.client.chat.completions.create(
+                        model=self.model_config.get('name', 'gpt-4o'),
+                        messages=self.conversation_history,
+                        max_tokens=self.model_config.get('maxTokens', 1500),
+                        temperature=self.model_config.get('temperature', 0.3)
+                    )
                 
                 assistant_message = response.choices[0].message.content
             
@@ -184,7 +212,7 @@ class ArxivChat:
             }
             
         except Exception as e:
-            self.logger.error(f"Chat error: {e}")
+            self.logger.error("Chat error: %s", e)
             return {
                 'success': False,
                 'error': str(e),
@@ -229,8 +257,8 @@ class ArxivChat:
             
     def get_conversation_summary(self) -> Dict:
         """Get a summary of the current conversation"""
-        user_messages = len([msg for msg in self.conversation_history if msg['role'] == 'user'])
-        assistant_messages = len([msg for msg in self.conversation_history if msg['role'] == 'assistant'])
+        role_counts = Counter(msg['role'] for msg in self.conversation_history)
+        user_messages = role_counts['user']
         
         return {
             'total_exchanges': user_messages,
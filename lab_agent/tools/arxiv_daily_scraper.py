@@ -1,154 +1,203 @@
+import asyncio
 import requests
+import aiohttp
 import logging
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+from lxml import etree, html
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import re
 
 
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+def _has_class(tag: str, cls: str) -> str:
+    """XPath step matching `tag` elements whose class list contains `cls`"""
+    return f"{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+
+
+# Per-paper patterns, compiled once
+_ABS_RE = re.compile(r'/abs/(\d+\.\d+)')
+_ARXIV_RE = re.compile(r'arXiv:(\d+\.\d+)', re.IGNORECASE)
+_TITLE_PREFIX_RE = re.compile(r'Title: ?')
+_SUBJECTS_PREFIX_RE = re.compile(r'Subjects: ?')
+
+_ENTRIES_XP = etree.XPath('//dd | //' + _has_class('div', 'list-entry'))
+
+# Per-field lookups on a paper entry, compiled once
+_TEXT_XP = etree.XPath('.//text()')
+_TITLE_XP = etree.XPath('.//' + _has_class('div', 'list-title'))
+_AUTHORS_XP = etree.XPath('.//' + _has_class('div', 'list-authors'))
+_ABSTRACT_XP = etree.XPath('.//' + _has_class('p', 'mathjax'))
+_PARAGRAPHS_XP = etree.XPath('.//p')
+_SUBJECTS_XP = etree.XPath('.//' + _has_class('div', 'list-subjects'))
+_ID_HREF_XP = etree.XPath(
+    './preceding-sibling::dt[1]//' + _has_class('span', 'list-identifier') + '//a/@href'
+)
+
+
+def _stripped_text(elem) -> str:
+    """Concatenated, stripped text of an element's subtree"""
+    return ''.join(text.strip() for text in _TEXT_XP(elem))
+
+
+def _first_text(xpath: etree.XPath, entry) -> str:
+    found = xpath(entry)
+    return _stripped_text(found[0]) if found else ""
+
+
 class ArxivDailyScraper:
     def __init__(self):
         self.logger = logging.getLogger("tools.arxiv_daily_scraper")
         self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.session.headers.update(_HEADERS)
+        # Parsed listings keyed by (url, hour), so repeated runs within the hour reuse them
+        self._listing_cache: Dict[Tuple[str, str], List[Dict[str, str]]] = {}
     
     def fetch_daily_papers(self, url: str = "https://arxiv.org/list/cond-mat/new") -> List[Dict[str, str]]:
+        hour = datetime.now().strftime('%Y-%m-%d-%H')
+        cached = self._listing_cache.get((url, hour))
+        if cached is not None:
+            self.logger.info(f"Using cached papers for: {url}")
+            return list(cached)
+        
         try:
             self.logger.info(f"Starting to fetch daily papers from: {url}")
-            print(f"[DEBUG] Fetching papers from: {url}")
             
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
-            print(f"[DEBUG] Successfully fetched page, status: {response.status_code}")
+            self.logger.debug("Fetched page, status: %s", response.status_code)
+            
+            papers = self._parse_listing(response.content)
+            if papers:
+                # Drop listings cached in earlier hours before storing this one
+                self._listing_cache = {
+                    key: value for key, value in self._listing_cache.items() if key[1] == hour
+                }
+                self._listing_cache[(url, hour)] = papers
+            return list(papers)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+        except Exception as e:
+            self.logger.exception("Error fetching papers: %s", e)
+            return []
+    
+    async def afetch_daily_papers(self, urls: List[str]) -> List[Dict[str, str]]:
+        """Fetch several listing pages concurrently; papers are returned in URL order"""
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(headers=_HEADERS, timeout=timeout) as session:
+            pages = await asyncio.gather(
+                *(self._afetch_page(session, url) for url in urls),
+                return_exceptions=True
+            )
+        
+        papers = []
+        for url, page in zip(urls, pages):
+            if isinstance(page, BaseException):
+                self.logger.error(f"Error fetching papers from {url}: {page}")
+                continue
+            papers.extend(self._parse_listing(page))
+        return papers
+    
+    async def _afetch_page(self, session: aiohttp.ClientSession, url: str) -> bytes:
+        self.logger.info(f"Starting to fetch daily papers from: {url}")
+        async with session.get(url) as response:
+            response.raise_for_status()
+            return await response.read()
+    
+    def _parse_listing(self, content: bytes) -> List[Dict[str, str]]:
+        """Parse the papers out of an arXiv listing page"""
+        try:
+            root = html.fromstring(content)
             papers = []
             
-            # Find all paper entries - try different selectors
-            paper_entries = soup.find_all('dd')
-            print(f"[DEBUG] Found {len(paper_entries)} dd elements")
-            
-            # If no dd elements, try alternative structure
-            if not paper_entries:
-                # Try finding paper entries by class
-                paper_entries = soup.find_all('div', class_='list-entry')
-                print(f"[DEBUG] Alternative search found {len(paper_entries)} div.list-entry elements")
-            
-            if not paper_entries:
-                # Try any div with paper-like content
-                paper_entries = soup.find_all('div', string=lambda text: text and 'Title:' in text)
-                print(f"[DEBUG] Third attempt found {len(paper_entries)} elements with 'Title:'")
-            
-            for i, entry in enumerate(paper_entries):
-                if i % 10 == 0:  # Progress update every 10 papers
-                    print(f"[DEBUG] Processing entry {i+1}")
-                paper = self._parse_paper_entry(entry)
+            # Find all paper entries (dd elements or div.list-entry) in a single pass
+            paper_entries = _ENTRIES_XP(root)
+            self.logger.debug("Found %d paper entries", len(paper_entries))
+            
+            fetched_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            for entry in paper_entries:
+                paper = self._parse_paper_entry(entry, fetched_date)
                 if paper and paper.get('title'):
                     papers.append(paper)
-                    if len(papers) <= 5:  # Only show first 5 for debugging
-                        print(f"[DEBUG] Successfully parsed paper: {paper['title'][:50]}...")
             
             self.logger.info(f"Found {len(papers)} valid papers")
-            print(f"[DEBUG] Total valid papers found: {len(papers)}")
             return papers
             
         except Exception as e:
-            self.logger.error(f"Error fetching papers: {e}")
-            print(f"[DEBUG] ERROR: {e}")
-            import traceback
-            print(f"[DEBUG] Traceback: {traceback.format_exc()}")
+            self.logger.exception("Error parsing papers: %s", e)
             return []
     
-    def _parse_paper_entry(self, entry) -> Optional[Dict[str, str]]:
+    def _parse_paper_entry(self, entry, fetched_date: str) -> Optional[Dict[str, str]]:
         try:
             # Initialize variables
-            title = ""
-            authors = ""
-            abstract = ""
-            subjects = ""
             arxiv_id = ""
             
             # Strategy 1: Look for standard ArXiv list structure
-            title_elem = entry.find('div', class_='list-title')
-            if title_elem:
-                title = title_elem.get_text(strip=True)
+            title = _first_text(_TITLE_XP, entry)
+            if title:
                 # Remove "Title:" prefix - handle both with and without space
-                if title.startswith('Title: '):
-                    title = title[7:]
-                elif title.startswith('Title:'):
-                    title = title[6:]
-            
-            # Strategy 2: Look for text that starts with "Title:"
-            if not title:
-                text = entry.get_text()
-                if 'Title:' in text:
-                    lines = text.split('\n')
-                    for line in lines:
-                        if line.strip().startswith('Title:'):
-                            title = line.strip()[6:].strip()
-                            break
+                match = _TITLE_PREFIX_RE.match(title)
+                if match:
+                    title = title[match.end():]
             
             # Find authors
-            authors_elem = entry.find('div', class_='list-authors')
-            if authors_elem:
-                authors = authors_elem.get_text(strip=True)
+            authors = _first_text(_AUTHORS_XP, entry)
+            if authors:
                 if authors.startswith('Authors: '):
                     authors = authors[9:]
             
-            # If no authors found via class, try text search
-            if not authors:
-                text = entry.get_text()
-                if 'Authors:' in text:
-                    lines = text.split('\n')
+            # Try to find arXiv ID from the previous dt element
+            hrefs = _ID_HREF_XP(entry)
+            if hrefs:
+                match = _ABS_RE.search(hrefs[0])
+                if match:
+                    arxiv_id = match.group(1)
+            
+            # Strategy 2: fall back to the entry's plain text, built and split once
+            if not title or not authors or not arxiv_id:
+                full_text = ''.join(_TEXT_XP(entry))
+                lines = [line.strip() for line in full_text.split('\n')]
+                
+                # Look for a line that starts with "Title:"
+                if not title and 'Title:' in full_text:
+                    for line in lines:
+                        if line.startswith('Title:'):
+                            title = line[6:].strip()
+                            break
+                
+                # If no authors found via class, try text search
+                if not authors and 'Authors:' in full_text:
                     for line in lines:
-                        if line.strip().startswith('Authors:'):
-                            authors = line.strip()[8:].strip()
+                        if line.startswith('Authors:'):
+                            authors = line[8:].strip()
                             break
+                
+                # Alternative: look for arXiv ID in text
+                if not arxiv_id:
+                    match = _ARXIV_RE.search(full_text)
+                    if match:
+                        arxiv_id = match.group(1)
             
             # Find abstract
-            abstract_elem = entry.find('p', class_='mathjax')
-            if abstract_elem:
-                abstract = abstract_elem.get_text(strip=True)
+            abstract = _first_text(_ABSTRACT_XP, entry)
             
             # If no abstract found, look for any paragraph
             if not abstract:
-                paragraphs = entry.find_all('p')
-                for p in paragraphs:
-                    text = p.get_text(strip=True)
+                for p in _PARAGRAPHS_XP(entry):
+                    text = _stripped_text(p)
                     if len(text) > 50:  # Assume abstracts are longer than 50 chars
                         abstract = text
                         break
             
-            # Try to find arXiv ID from the previous dt element
-            prev_dt = entry.find_previous_sibling('dt')
-            if prev_dt:
-                id_span = prev_dt.find('span', class_='list-identifier')
-                if id_span:
-                    id_link = id_span.find('a')
-                    if id_link:
-                        href = id_link.get('href', '')
-                        match = re.search(r'/abs/(\d+\.\d+)', href)
-                        if match:
-                            arxiv_id = match.group(1)
-            
-            # Alternative: look for arXiv ID in text
-            if not arxiv_id:
-                text = entry.get_text()
-                match = re.search(r'arXiv:(\d+\.\d+)', text, re.IGNORECASE)
-                if match:
-                    arxiv_id = match.group(1)
-            
             # Find subjects
-            subjects_elem = entry.find('div', class_='list-subjects')
-            if subjects_elem:
-                subjects = subjects_elem.get_text(strip=True)
+            subjects = _first_text(_SUBJECTS_XP, entry)
+            if subjects:
                 # Remove "Subjects:" prefix - handle both with and without space
-                if subjects.startswith('Subjects: '):
-                    subjects = subjects[10:]
-                elif subjects.startswith('Subjects:'):
-                    subjects = subjects[9:]
+                match = _SUBJECTS_PREFIX_RE.match(subjects)
+                if match:
+                    subjects = subjects[match.end():]
             
             # Only return if we have at least a title
             if not title:
@@ -162,7 +211,7 @@ class ArxivDailyScraper:
                 'subjects': subjects,
                 'url': f'https://arxiv.org/abs/{arxiv_id}' if arxiv_id else '',
                 'pdf_url': f'https://arxiv.org/pdf/{arxiv_id}.pdf' if arxiv_id else '',
-                'fetched_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'fetched_date': fetched_date
             }
             
             return paper
@@ -171,5 +220,9 @@ class ArxivDailyScraper:
             self.logger.error(f"Error parsing paper entry: {e}")
             return None
     
+    def clear_cache(self):
+        """Forget cached listings so the next fetch hits arXiv again"""
+        self._listing_cache.clear()
+    
     def close(self):
         self.session.close()
\ No newline at end of file
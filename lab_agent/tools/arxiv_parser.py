@@ -1,15 +1,25 @@
+import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
+import aiohttp
 import feedparser
 import requests
 from datetime import datetime
 import pytz
 
+# Maximum number of queries whose validators and parsed papers are kept for conditional GETs
+_ETAG_CACHE_SIZE = 64
+
 
 class ArxivParser:
     def __init__(self, base_url: str = "http://export.arxiv.org/api/query"):
         self.base_url = base_url
         self.logger = logging.getLogger("tools.arxiv_parser")
+        # Keep-alive connection pool reused across API queries
+        self.session = requests.Session()
+        # LRU of query params -> (validator headers, parsed papers) for conditional GETs
+        self._etag_cache: "OrderedDict[Tuple, Tuple[Dict[str, str], List[Dict[str, Any]]]]" = OrderedDict()
         
     def search_papers(
         self, 
@@ -19,25 +29,43 @@ class ArxivParser:
         sort_order: str = "descending"
     ) -> List[Dict[str, Any]]:
         try:
-            params = {
-                "search_query": query,
-                "start": 0,
-                "max_results": max_results,
-                "sortBy": sort_by,
-                "sortOrder": sort_order
-            }
-            
             self.logger.info(f"Searching ArXiv for: {query}")
-            response = requests.get(self.base_url, params=params)
-            response.raise_for_status()
+            papers = self._fetch_papers(self._search_params(query, max_results, sort_by, sort_order))
             
-            feed = feedparser.parse(response.content)
+            self.logger.info(f"Found {len(papers)} papers")
+            return papers
+            
+        except Exception as e:
+            self.logger.error(f"Error searching ArXiv: {e}")
+            return []
+    
+    async def asearch_many(
+        self,
+        queries: List[str],
+        max_results: int = 10,
+        sort_by: str = "submittedDate",
+        sort_order: str = "descending"
+    ) -> List[List[Dict[str, Any]]]:
+        """Run several searches concurrently; results are returned in query order"""
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            return list(await asyncio.gather(*(
+                self._asearch(session, query, max_results, sort_by, sort_order)
+                for query in queries
+            )))
+    
+    async def _asearch(
+        self,
+        session: aiohttp.ClientSession,
+        query: str,
+        max_results: int,
+        sort_by: str,
+        sort_order: str
+    ) -> List[Dict[str, Any]]:
+        try:
+            self.logger.info(f"Searching ArXiv for: {query}")
+            papers = await self._afetch_papers(session, self._search_params(query, max_results, sort_by, sort_order))
             
-            papers = []
-            for entry in feed.entries:
-                paper = self._parse_entry(entry)
-                papers.append(paper)
-                
             self.logger.info(f"Found {len(papers)} papers")
             return papers
             
@@ -45,6 +73,76 @@ class ArxivParser:
             self.logger.error(f"Error searching ArXiv: {e}")
             return []
     
+    @staticmethod
+    def _search_params(query: str, max_results: int, sort_by: str, sort_order: str) -> Dict[str, Any]:
+        return {
+            "search_query": query,
+            "start": 0,
+            "max_results": max_results,
+            "sortBy": sort_by,
+            "sortOrder": sort_order
+        }
+    
+    def _fetch_papers(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Query the API, skipping download and parse when the feed is unchanged (HTTP 304)"""
+        cache_key, cached = self._conditional_request(params)
+        
+        response = self.session.get(self.base_url, params=params, headers=cached[0] if cached else None)
+        if cached and response.status_code == 304:
+            return self._cached_papers(cache_key, cached)
+        response.raise_for_status()
+        
+        # Hand feedparser decoded text when the server declared the charset
+        if 'charset' in response.headers.get('Content-Type', ''):
+            content = response.text
+        else:
+            content = response.content
+        return self._store_papers(cache_key, response.headers, self._parse_feed(content))
+    
+    async def _afetch_papers(self, session: aiohttp.ClientSession, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Async version of _fetch_papers, sharing its conditional-GET cache"""
+        cache_key, cached = self._conditional_request(params)
+        
+        async with session.get(self.base_url, params=params, headers=cached[0] if cached else None) as response:
+            if cached and response.status == 304:
+                return self._cached_papers(cache_key, cached)
+            response.raise_for_status()
+            content = await response.text() if response.charset else await response.read()
+            return self._store_papers(cache_key, response.headers, self._parse_feed(content))
+    
+    def _conditional_request(self, params: Dict[str, Any]) -> Tuple[Tuple, Optional[Tuple[Dict[str, str], List[Dict[str, Any]]]]]:
+        """Cache key for the query and its (validator headers, papers) entry, if it was fetched before"""
+        cache_key = tuple(sorted(params.items()))
+        return cache_key, self._etag_cache.get(cache_key)
+    
+    def _cached_papers(self, cache_key: Tuple, cached: Tuple[Dict[str, str], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        self.logger.debug("Feed unchanged for %s, using cached results", cache_key)
+        # The entry may have been evicted by a concurrent fetch since the request was sent
+        if cache_key in self._etag_cache:
+            self._etag_cache.move_to_end(cache_key)
+        # Copies, so callers cannot change the cached papers
+        return [dict(paper) for paper in cached[1]]
+    
+    def _store_papers(self, cache_key: Tuple, response_headers, papers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Remember the papers with the response's validators; returns the papers for the caller"""
+        validators = {}
+        if response_headers.get('ETag'):
+            validators['If-None-Match'] = response_headers['ETag']
+        if response_headers.get('Last-Modified'):
+            validators['If-Modified-Since'] = response_headers['Last-Modified']
+        if not validators:
+            return papers
+        
+        self._etag_cache[cache_key] = (validators, papers)
+        self._etag_cache.move_to_end(cache_key)
+        if len(self._etag_cache) > _ETAG_CACHE_SIZE:
+            self._etag_cache.popitem(last=False)
+        return [dict(paper) for paper in papers]
+    
+    def _parse_feed(self, content) -> List[Dict[str, Any]]:
+        feed = feedparser.parse(content)
+        return [self._parse_entry(entry) for entry in feed.entries]
+    
     def _parse_entry(self, entry) -> Dict[str, Any]:
         authors = []
         if hasattr(entry, 'authors'):
@@ -106,13 +204,10 @@ class ArxivParser:
                 "max_results": 1
             }
             
-            response = requests.get(self.base_url, params=params)
-            response.raise_for_status()
-            
-            feed = feedparser.parse(response.content)
+            papers = self._fetch_papers(params)
             
-            if feed.entries:
-                return self._parse_entry(feed.entries[0])
+            if papers:
+                return papers[0]
             else:
                 self.logger.warning(f"Paper {arxiv_id} not found")
                 return None
@@ -135,4 +230,7 @@ class ArxivParser:
         max_results: int = 10
     ) -> List[Dict[str, Any]]:
         query = f"au:{author}"
-        return self.search_papers(query, max_results)
\ No newline at end of file
+        return self.search_papers(query, max_results)
+    
+    def close(self):
+        self.session.close()
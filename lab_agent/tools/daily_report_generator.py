@@ -1,69 +1,23 @@
+import asyncio
+import functools
 import os
-import json
 import logging
+import mmap
 from datetime import datetime
+from itertools import chain
+from pathlib import Path
 from typing import List, Dict, Optional
-from jinja2 import Template
+from jinja2 import DictLoader, Environment, FileSystemBytecodeCache, Template
+from ..utils import fast_json
 
 
-class DailyReportGenerator:
-    def __init__(self, reports_dir: str = "./reports"):
-        self.reports_dir = reports_dir
-        self.logger = logging.getLogger("tools.daily_report_generator")
-        
-        # Create reports directory if it doesn't exist
-        os.makedirs(reports_dir, exist_ok=True)
-        
-    def generate_daily_report(self, papers: List[Dict], date: str = None) -> Dict[str, str]:
-        if date is None:
-            date = datetime.now().strftime('%Y-%m-%d')
-            
-        # Check if report already exists
-        report_path = os.path.join(self.reports_dir, f"{date}.json")
-        if os.path.exists(report_path):
-            self.logger.info(f"Report for {date} already exists")
-            with open(report_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        
-        # Separate papers by priority
-        priority_papers = self._organize_by_priority(papers)
-        
-        # Generate HTML and JSON reports
-        html_content = self._generate_html_report(priority_papers, date)
-        json_data = self._generate_json_report(priority_papers, date)
-        
-        # Save reports
-        html_path = os.path.join(self.reports_dir, f"{date}.html")
-        json_path = os.path.join(self.reports_dir, f"{date}.json")
-        
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-            
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, indent=2, ensure_ascii=False)
-        
-        self.logger.info(f"Generated daily report for {date}: {len(papers)} papers")
-        
-        return {
-            'date': date,
-            'html_path': html_path,
-            'json_path': json_path,
-            'html_content': html_content,
-            'json_data': json_data
-        }
-    
-    def _organize_by_priority(self, papers: List[Dict]) -> Dict[str, List[Dict]]:
-        priority_papers = {"1": [], "2": [], "3": []}
-        
-        for paper in papers:
-            score = str(paper.get('score', 1))  # Convert to string
-            if score in priority_papers:
-                priority_papers[score].append(paper)
-        
-        return priority_papers
-    
-    def _generate_html_report(self, priority_papers: Dict[str, List[Dict]], date: str) -> str:
-        html_template = """
+# Report files at least this large are parsed through mmap
+_MMAP_MIN_SIZE = 1 << 20
+
+# Paper scores (as stored, int or str) -> priority bucket index
+_SCORE_BUCKETS = {3: 3, 2: 2, 1: 1, "3": 3, "2": 2, "1": 1}
+
+_HTML_TEMPLATE_SRC = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -167,9 +121,130 @@ class DailyReportGenerator:
     </div>
 </body>
 </html>
-        """
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def _html_template() -> Template:
+    """The report template, compiled on first use.
+
+    Compiled bytecode is cached on disk (in a per-user temp directory), so
+    later processes skip lexing, parsing and compiling the template.
+    """
+    env = Environment(
+        loader=DictLoader({'report.html': _HTML_TEMPLATE_SRC}),
+        bytecode_cache=FileSystemBytecodeCache(),
+        auto_reload=False
+    )
+    return env.get_template('report.html')
+
+
+class DailyReportGenerator:
+    def __init__(self, reports_dir: str = "./reports"):
+        self.reports_dir = reports_dir
+        self.logger = logging.getLogger("tools.daily_report_generator")
+        
+        # Create reports directory if it doesn't exist
+        os.makedirs(reports_dir, exist_ok=True)
+        
+    def generate_daily_report(self, papers: List[Dict], date: str = None,
+                              write_html: bool = True, write_json: bool = True) -> Dict[str, str]:
+        """Build and save the report for `date`; pass write_html=False when only the JSON is needed"""
+        if date is None:
+            date = datetime.now().strftime('%Y-%m-%d')
+            
+        # Check if report already exists
+        report_path = os.path.join(self.reports_dir, f"{date}.json")
+        if os.path.exists(report_path):
+            self.logger.info(f"Report for {date} already exists")
+            return self._read_json(report_path)
+        
+        report = self._build_report(papers, date, write_html)
+        
+        # Save reports
+        if write_html:
+            self._write_file(report['html_path'], report['html_content'])
+        if write_json:
+            self._write_file(report['json_path'], fast_json.dumps(report['json_data'], indent=True))
+        
+        self.logger.info(f"Generated daily report for {date}: {len(papers)} papers")
+        
+        return report
+    
+    async def agenerate_daily_report(self, papers: List[Dict], date: str = None,
+                                     write_html: bool = True, write_json: bool = True) -> Dict[str, str]:
+        """Async variant of generate_daily_report; the HTML and JSON files are written concurrently"""
+        if date is None:
+            date = datetime.now().strftime('%Y-%m-%d')
+        
+        loop = asyncio.get_running_loop()
+        
+        # Check if report already exists
+        report_path = os.path.join(self.reports_dir, f"{date}.json")
+        if os.path.exists(report_path):
+            self.logger.info(f"Report for {date} already exists")
+            return await loop.run_in_executor(None, self._read_json, report_path)
+        
+        report = self._build_report(papers, date, write_html)
         
-        template = Template(html_template)
+        # Save reports
+        writes = []
+        if write_html:
+            writes.append(loop.run_in_executor(
+                None, self._write_file, report['html_path'], report['html_content']
+            ))
+        if write_json:
+            writes.append(loop.run_in_executor(
+                None, self._write_file, report['json_path'],
+                fast_json.dumps(report['json_data'], indent=True)
+            ))
+        await asyncio.gather(*writes)
+        
+        self.logger.info(f"Generated daily report for {date}: {len(papers)} papers")
+        
+        return report
+    
+    def _build_report(self, papers: List[Dict], date: str, render_html: bool = True) -> Dict:
+        # Separate papers by priority
+        priority_papers = self._organize_by_priority(papers)
+        
+        # Generate HTML and JSON reports
+        return {
+            'date': date,
+            'html_path': os.path.join(self.reports_dir, f"{date}.html"),
+            'json_path': os.path.join(self.reports_dir, f"{date}.json"),
+            'html_content': self._generate_html_report(priority_papers, date) if render_html else "",
+            'json_data': self._generate_json_report(priority_papers, date)
+        }
+    
+    @staticmethod
+    def _read_json(path: str) -> Dict:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < _MMAP_MIN_SIZE:
+                return fast_json.loads(f.read())
+            # Large reports: parse straight from the page cache instead of copying into a buffer
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return fast_json.loads(view)
+    
+    @staticmethod
+    def _write_file(path: str, content: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+    
+    def _organize_by_priority(self, papers: List[Dict]) -> Dict[str, List[Dict]]:
+        # Bucket papers by priority score (index 0 unused)
+        buckets = [None, [], [], []]
+        
+        for paper in papers:
+            bucket = _SCORE_BUCKETS.get(paper.get('score', 1))
+            if bucket is not None:
+                buckets[bucket].append(paper)
+        
+        return {"1": buckets[1], "2": buckets[2], "3": buckets[3]}
+    
+    def _generate_html_report(self, priority_papers: Dict[str, List[Dict]], date: str) -> str:
+        template = _html_template()
         
         priority_counts = {i: len(papers) for i, papers in priority_papers.items()}
         total_papers = sum(priority_counts.values())
@@ -193,7 +268,7 @@ class DailyReportGenerator:
                 'priority_counts': priority_counts
             },
             'papers_by_priority': priority_papers,
-            'all_papers': [paper for papers in priority_papers.values() for paper in papers]
+            'all_papers': list(chain.from_iterable(priority_papers.values()))
         }
     
     def list_existing_reports(self) -> List[str]:
@@ -201,11 +276,12 @@ class DailyReportGenerator:
         if not os.path.exists(self.reports_dir):
             return []
             
-        reports = []
-        for filename in os.listdir(self.reports_dir):
-            if filename.endswith('.json') and not filename.startswith('.'):
-                date = filename[:-5]  # Remove .json extension
-                reports.append(date)
+        with os.scandir(self.reports_dir) as entries:
+            reports = [
+                entry.name[:-5]  # Remove .json extension
+                for entry in entries
+                if entry.name.endswith('.json') and not entry.name.startswith('.') and entry.is_file()
+            ]
         
         return sorted(reports, reverse=True)  # Most recent first
     
@@ -217,13 +293,11 @@ class DailyReportGenerator:
         if not os.path.exists(json_path):
             return None
             
-        with open(json_path, 'r', encoding='utf-8') as f:
-            json_data = json.load(f)
+        json_data = self._read_json(json_path)
         
         html_content = ""
         if os.path.exists(html_path):
-            with open(html_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
+            html_content = Path(html_path).read_text(encoding='utf-8')
         
         return {
             'date': date,
@@ -239,10 +313,11 @@ class DailyReportGenerator:
             return 0
             
         count = 0
-        for filename in os.listdir(self.reports_dir):
-            if filename.endswith(('.json', '.html')):
-                os.remove(os.path.join(self.reports_dir, filename))
-                count += 1
+        with os.scandir(self.reports_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(('.json', '.html')):
+                    os.remove(entry.path)
+                    count += 1
                 
         self.logger.info(f"Cleared {count} report files")
         return count
\ No newline at end of file
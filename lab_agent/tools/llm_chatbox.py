@@ -1,24 +1,272 @@
-import json
+import atexit
+import functools
 import logging
+import logging.handlers
 import os
 import asyncio
 import base64
+import copy
+import itertools
+import queue
+import threading
+import time
+from collections import deque
 from pathlib import Path
-from typing import List, Dict, Optional, Any
-from .llm_client import LLMClient
-from ..utils.tool_manager import ToolManager
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .llm_client import get_llm_client
+from ..utils import fast_json
+from ..utils.tool_manager import ToolManager, activation_state_version
+
+
+_CHATBOX_CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 
+    'config', 
+    'llm_chatbox_config.json'
+)
+
+# Used when the config file is missing; shared, so treat nested sections as read-only
+_DEFAULT_CHATBOX_CONFIG = {
+    "purpose": "general_assistant",
+    "config": {
+        "text": {"format": {"type": "text"}, "verbosity": "high"},
+        "reasoning": {"effort": "medium", "summary": "auto"},
+        "tools": [],
+        "store": True,
+        "include": ["reasoning.encrypted_content"]
+    },
+    "system_prompt": "You are a helpful AI assistant for laboratory management.",
+    "conversation_settings": {
+        "max_exchanges": 50,
+        "context_window": 10,
+        "enable_reasoning_display": True
+    },
+    "ui_settings": {
+        "title": "AI Assistant",
+        "placeholder_text": "Ask me anything...",
+        "suggested_prompts": ["Help me with research questions"]
+    }
+}
+
+
+# Fixed parts of the tools section appended to the system prompt
+_TOOLS_CONTEXT_HEADER = """
+## Available Tools
+
+You have access to the following MCP tools for ArXiv Daily reports:
+
+"""
+_TOOLS_CONTEXT_USAGE = """### Tool Usage
+When users ask about ArXiv papers, reports, or want to generate new reports, you can:
+- Use `read_daily_report` to read existing reports and provide analysis
+- Use `generate_daily_report` to create new daily reports
+- Use `list_available_reports` to show available reports
+
+Always provide helpful context and summaries when using these tools.
+"""
+
+
+@functools.lru_cache(maxsize=4)
+def _load_chatbox_config(path: str, mtime_ns: int) -> Dict:
+    """Parse a chatbox config file; mtime is part of the key so edits are picked up"""
+    with open(path, 'rb') as f:
+        return fast_json.loads(f.read())
+
+
+# Write buffer for the conversation trace file; it is flushed once queued records drain
+_TRACE_BUFFER_SIZE = 128 * 1024
+
+_trace_handler: Optional[logging.Handler] = None
+_trace_handler_lock = threading.Lock()
+
+
+class _BatchedFileHandler(logging.FileHandler):
+    """File handler with a large write buffer, flushed only when no records are pending"""
+    
+    def __init__(self, filename: str, pending: queue.Queue):
+        self._pending = pending
+        super().__init__(filename, mode='a', encoding='utf-8', delay=True)
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=_TRACE_BUFFER_SIZE, encoding=self.encoding)
+    
+    def flush(self):
+        # Under load the queue is non-empty and writes accumulate; once idle, the file is current
+        if self._pending.empty():
+            super().flush()
+
+
+def _conversation_trace_handler(log_file: str) -> logging.Handler:
+    """Queue handler shared by all chatboxes; a background listener thread does the file writes"""
+    global _trace_handler
+    with _trace_handler_lock:
+        if _trace_handler is None:
+            pending = queue.Queue(-1)
+            file_handler = _BatchedFileHandler(log_file, pending)
+            file_handler.setLevel(logging.DEBUG)
+            file_handler.setFormatter(logging.Formatter(
+                '%(asctime)s | %(levelname)s | %(message)s',
+                datefmt='%Y-%m-%d %H:%M:%S'
+            ))
+            listener = logging.handlers.QueueListener(pending, file_handler, respect_handler_level=True)
+            listener.start()
+            # Runs before logging's own shutdown hook, which then flushes and closes the file
+            atexit.register(listener.stop)
+            _trace_handler = logging.handlers.QueueHandler(pending)
+        return _trace_handler
+
+
+@functools.lru_cache(maxsize=1)
+def _mcp_client_factory() -> Optional[Callable[[], Any]]:
+    """get_mcp_client, resolved on first use; None when the MCP dependencies are missing"""
+    # Imported lazily to avoid circular imports and to keep MCP packages out of
+    # chatboxes that have MCP disabled
+    try:
+        from ..mcp.client import get_mcp_client
+    except ImportError as e:
+        logging.getLogger("tools.llm_chatbox").error(f"MCP client unavailable: {e}")
+        return None
+    return get_mcp_client
+
+
+@functools.lru_cache(maxsize=256)
+def _title_case(key: str) -> str:
+    """Display name for a data key, e.g. 'total_papers' -> 'Total Papers'"""
+    return key.replace('_', ' ').title()
+
+
+def _truncate_abstract(paper: Dict[str, Any], limit: int = 200) -> str:
+    """Paper abstract cut to `limit` characters, looked up once"""
+    abstract = paper.get('abstract') or 'N/A'
+    return abstract[:limit] + "..." if len(abstract) > limit else abstract
+
+
+def _format_generic(value: Any, key: str) -> List[str]:
+    """Generic formatting for data keys without a dedicated formatter"""
+    if isinstance(value, (dict, list)):
+        # Emit containers as JSON rather than Python repr, so the model reads them unambiguously
+        value = fast_json.dumps(value, default=str)
+    return [f"\n{_title_case(key)}: {value}"]
+
+
+def _format_high_priority_papers(value: Any, key: str) -> List[str]:
+    if not isinstance(value, list):
+        return _format_generic(value, key)
+    
+    parts = [f"\nHigh Priority Papers ({len(value)} papers):"]
+    for i, paper in enumerate(value, 1):
+        if isinstance(paper, dict):
+            parts.extend((
+                f"\n{i}. Title: {paper.get('title', 'N/A')}",
+                f"   Authors: {paper.get('authors', 'N/A')}",
+                f"   Abstract: {_truncate_abstract(paper)}",
+                f"   AI Assessment: {paper.get('ai_assessment', 'N/A')}"
+            ))
+    return parts
+
+
+def _format_search_results(value: Any, key: str) -> List[str]:
+    """Search results from search_papers_by_author"""
+    if not isinstance(value, dict):
+        return _format_generic(value, key)
+    
+    matching_papers = value.get('matching_papers', [])
+    parts = [
+        "\nAuthor Search Results:",
+        f"Papers searched: {value.get('total_papers_searched', 0)}",
+        f"Papers found: {len(matching_papers)}"
+    ]
+    
+    if matching_papers:
+        parts.append("\nMatching Papers:")
+        for i, paper in enumerate(matching_papers, 1):
+            if isinstance(paper, dict):
+                parts.extend((
+                    f"\n{i}. Title: {paper.get('title', 'N/A')}",
+                    f"   Authors: {paper.get('authors', 'N/A')}",
+                    f"   Priority: {paper.get('priority', 'N/A')}",
+                    f"   Abstract: {_truncate_abstract(paper)}",
+                    f"   AI Assessment: {paper.get('ai_assessment', 'N/A')}"
+                ))
+    return parts
+
+
+def _format_search_query(value: Any, key: str) -> List[str]:
+    if not isinstance(value, dict):
+        return _format_generic(value, key)
+    
+    return [
+        "\nSearch Query:",
+        f"Author: {value.get('author_name', 'N/A')}",
+        f"Match Type: {value.get('match_type', 'N/A')}",
+        f"Report Date: {value.get('date', 'N/A')}"
+    ]
+
+
+def _format_reports(value: Any, key: str) -> List[str]:
+    if not isinstance(value, list):
+        return _format_generic(value, key)
+    
+    parts = [f"\nAvailable Reports ({len(value)} reports):"]
+    for report in value:
+        if isinstance(report, dict):
+            parts.append(
+                f"- {report.get('date', 'N/A')}: {report.get('total_papers', 0)} papers "
+                f"({report.get('priority_3_count', 0)} high priority)"
+            )
+    return parts
+
+
+def _format_summary(value: Any, key: str) -> List[str]:
+    if not isinstance(value, dict):
+        return _format_generic(value, key)
+    
+    parts = ["\nSummary:"]
+    for summary_key, summary_value in value.items():
+        parts.append(f"- {_title_case(summary_key)}: {summary_value}")
+    return parts
+
+
+# Tool result data key -> formatter(value, key) returning the lines for that key
+_FORMATTERS: Dict[str, Callable[[Any, str], List[str]]] = {
+    'high_priority_papers': _format_high_priority_papers,
+    'search_results': _format_search_results,
+    'search_query': _format_search_query,
+    'reports': _format_reports,
+    'summary': _format_summary,
+}
 
 
 class LLMChatbox:
     """LLM chatbox for general assistance and MCP tool integration"""
     
+    # Prepared tools shared by all chatboxes: (mcp client id, model, activation version) -> (timestamp, tools)
+    _tools_cache: Dict[Tuple[int, str, int], Tuple[float, List[Dict[str, Any]]]] = {}
+    # In-flight tool preparation per key, so concurrent chats on one loop share a single fetch
+    _tools_inflight: Dict[Tuple[int, str, int], asyncio.Future] = {}
+    TOOLS_CACHE_TTL = 30.0
+    
     def __init__(self):
         self.logger = logging.getLogger("tools.llm_chatbox")
-        self.client = LLMClient()
+        self.client = get_llm_client()
         self.config = self._load_config()
-        self.conversation_history = []
+        # Model config shared read-only across turns
+        self._base_config = MappingProxyType(self.config.get("config") or {})
+        # System prompt is pinned separately; history holds only the turns after it
+        self._system_msg = {"role": "system", "content": ""}
+        self._history = deque()
+        # Number of history messages already written to the conversation trace
+        self._logged_count = 0
         self.mcp_client = None
         self.available_tools = []
+        # Detailed tool results for the current chat turn, shown collapsed in the UI
+        self._tool_results: List[Dict[str, Any]] = []
+        # Tools system-prompt section, built once: self.config does not change after init
+        self._tools_context_cache: Optional[str] = None
+        # (tool-set key, payload) cache for the API tools payload
+        self._tools_payload_cache = None
+        # (activation key, payload) cache for get_mcp_tools_info
+        self._mcp_info_cache = None
         
         # Initialize detailed conversation logging to file
         self._setup_conversation_logging()
@@ -38,24 +286,20 @@ class LLMChatbox:
         
         # Setup conversation logger that writes to file
         self.conversation_logger = logging.getLogger("conversation_trace")
-        self.conversation_logger.setLevel(logging.DEBUG)
-        
-        # Remove existing handlers to avoid duplicates
-        for handler in self.conversation_logger.handlers[:]:
-            self.conversation_logger.removeHandler(handler)
+        # Follows LOG_LEVEL; per-message previews are only written at DEBUG
+        self.conversation_logger.setLevel(getattr(logging, self.client.config.log_level.upper(), logging.INFO))
         
-        # File handler for detailed conversation logs
+        # Records are queued here and written to the file by a background thread,
+        # so logging never blocks the event loop on disk I/O
         log_file = os.path.join(logs_dir, "conversation_trace.log")
-        file_handler = logging.FileHandler(log_file, mode='a', encoding='utf-8')
-        file_handler.setLevel(logging.DEBUG)
+        trace_handler = _conversation_trace_handler(log_file)
         
-        # Detailed formatter
-        formatter = logging.Formatter(
-            '%(asctime)s | %(levelname)s | %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        file_handler.setFormatter(formatter)
-        self.conversation_logger.addHandler(file_handler)
+        # Remove other handlers to avoid duplicates
+        for handler in self.conversation_logger.handlers[:]:
+            if handler is not trace_handler:
+                self.conversation_logger.removeHandler(handler)
+        if trace_handler not in self.conversation_logger.handlers:
+            self.conversation_logger.addHandler(trace_handler)
         
         # Prevent propagation to root logger to avoid console output
         self.conversation_logger.propagate = False
@@ -65,23 +309,32 @@ class LLMChatbox:
         self.conversation_logger.info("=" * 80)
     
     def _log_conversation_state(self, context: str):
-        """Log the current state of conversation history"""
-        self.conversation_logger.info(f"CONVERSATION STATE - {context}")
-        self.conversation_logger.info(f"Total messages: {len(self.conversation_history)}")
+        """Log the conversation totals and the messages added since the last call"""
+        history = self._history
+        if not self.conversation_logger.isEnabledFor(logging.INFO):
+            self._logged_count = len(history)
+            return
+        start = self._logged_count
+        self.conversation_logger.info("CONVERSATION STATE - %s", context)
+        # The system message is kept separately and counted here as message 0
+        self.conversation_logger.info("Total messages: %d (%d new)", len(history) + 1, len(history) - start)
         
-        for i, msg in enumerate(self.conversation_history):
-            role = msg.get('role', 'unknown')
-            content = msg.get('content', '')
-            content_preview = content[:100].replace('\n', ' ') + ('...' if len(content) > 100 else '')
-            
-            extra_info = ""
-            if 'tool_calls' in msg:
-                extra_info = f" [HAS TOOL_CALLS: {len(msg['tool_calls'])}]"
-            elif 'tool_call_id' in msg:
-                extra_info = f" [TOOL_RESULT for {msg['tool_call_id']}]"
-            
-            self.conversation_logger.info(f"  [{i}] {role.upper()}: {content_preview}{extra_info}")
+        # Previewing each message is the expensive part, so it is skipped unless tracing at DEBUG
+        if self.conversation_logger.isEnabledFor(logging.DEBUG):
+            for i, msg in enumerate(itertools.islice(history, start, None), start + 1):
+                role = msg.get('role', 'unknown')
+                content = msg.get('content', '')
+                content_preview = content[:100].replace('\n', ' ') + ('...' if len(content) > 100 else '')
+                
+                extra_info = ""
+                if 'tool_calls' in msg:
+                    extra_info = f" [HAS TOOL_CALLS: {len(msg['tool_calls'])}]"
+                elif 'tool_call_id' in msg:
+                    extra_info = f" [TOOL_RESULT for {msg['tool_call_id']}]"
+                
+                self.conversation_logger.debug("  [%d] %s: %s%s", i, role.upper(), content_preview, extra_info)
         
+        self._logged_count = len(history)
         self.conversation_logger.info("-" * 50)
     
     def _extract_filename_from_placeholder(self, file_path: str) -> str:
@@ -208,30 +461,31 @@ class LLMChatbox:
         """Handle multiple rounds of tool calls until LLM provides final response"""
         current_result = initial_result
         api_call_count = 1
+        trace = self.conversation_logger
         
         # Get max iterations from config (default to 20)
         max_iterations = self.config.get("conversation_settings", {}).get("max_tool_call_iterations", 20)
-        self.conversation_logger.info(f"MAX TOOL CALL ITERATIONS SET TO: {max_iterations}")
+        trace.info("MAX TOOL CALL ITERATIONS SET TO: %d", max_iterations)
         
         while api_call_count <= max_iterations:
             tool_calls = current_result.get('metadata', {}).get('tool_calls', [])
             if not tool_calls:
                 # No more tool calls - this is the final response
                 final_content = current_result.get('content', '')
-                self.conversation_logger.info(f"FINAL RESPONSE AFTER {api_call_count} API CALLS - Length: {len(final_content)} chars")
+                trace.info("FINAL RESPONSE AFTER %d API CALLS - Length: %d chars", api_call_count, len(final_content))
                 
                 # Add final assistant response to conversation history
-                self.conversation_history.append({
+                self._history.append({
                     "role": "assistant",
                     "content": final_content
                 })
                 return final_content
             
-            self.logger.info(f"Executing {len(tool_calls)} tool calls (round {api_call_count})")
-            self.conversation_logger.info(f"API CALL #{api_call_count} TOOL CALLS: {len(tool_calls)} tools")
-            for i, tc in enumerate(tool_calls):
-                tool_name = tc.get('name') or tc.get('function', {}).get('name')
-                self.conversation_logger.info(f"  Tool {i+1}: {tool_name}")
+            self.logger.info("Executing %d tool calls (round %d)", len(tool_calls), api_call_count)
+            trace.info("API CALL #%d TOOL CALLS: %d tools", api_call_count, len(tool_calls))
+            if trace.isEnabledFor(logging.INFO):
+                for i, tc in enumerate(tool_calls, 1):
+                    trace.info("  Tool %d: %s", i, tc.get('name') or tc.get('function', {}).get('name'))
             
             # STEP 1: Add assistant message with tool calls to conversation history
             assistant_message = {
@@ -252,100 +506,108 @@ class LLMChatbox:
                             "type": "function",
                             "function": {
                                 "name": tool_call.get('name'),
-                                "arguments": json.dumps(tool_call.get('arguments', {}))
+                                "arguments": fast_json.dumps(tool_call.get('arguments', {}))
                             }
                         })
                 assistant_message["tool_calls"] = formatted_tool_calls
             
-            self.conversation_history.append(assistant_message)
-            self.conversation_logger.info(f"ADDED ASSISTANT MESSAGE #{api_call_count} WITH TOOL CALLS")
+            self._history.append(assistant_message)
+            trace.info("ADDED ASSISTANT MESSAGE #%d WITH TOOL CALLS", api_call_count)
             
-            # STEP 2: Execute tools and add results as "tool" role messages
+            # STEP 2: Execute tools concurrently and add results as "tool" role messages
+            calls = []
             for i, tool_call in enumerate(tool_calls):
                 tool_name = tool_call.get('name') or tool_call.get('function', {}).get('name')
                 tool_args = tool_call.get('arguments', {}) or tool_call.get('function', {}).get('arguments', {})
                 tool_call_id = tool_call.get('id') or f"call_{i}"
                 
                 if tool_name:
-                    self.logger.info(f"Executing {tool_name}")
-                    self.conversation_logger.info(f"EXECUTING TOOL #{api_call_count}: {tool_name} with args: {tool_args}")
-                    tool_result = await self._execute_tool_call(tool_name, tool_args)
-                    self.conversation_logger.info(f"TOOL RESULT #{api_call_count}: Success={tool_result.get('success')}, Message={tool_result.get('message', 'No message')}")
-                    
-                    # Store results for UI display
-                    tool_call_results.append({
+                    self.logger.info("Executing %s", tool_name)
+                    trace.info("EXECUTING TOOL #%d: %s with args: %s", api_call_count, tool_name, tool_args)
+                    calls.append((tool_name, tool_args, tool_call_id))
+            
+            results = await asyncio.gather(
+                *(self._execute_tool_call(tool_name, tool_args) for tool_name, tool_args, _ in calls),
+                return_exceptions=True
+            )
+            
+            for (tool_name, tool_args, tool_call_id), tool_result in zip(calls, results):
+                if isinstance(tool_result, BaseException):
+                    tool_result = {"success": False, "error": str(tool_result)}
+                
+                trace.info("TOOL RESULT #%d: Success=%s, Message=%s", api_call_count, tool_result.get('success'), tool_result.get('message', 'No message'))
+                
+                # Store results for UI display
+                tool_call_results.append({
+                    'tool_name': tool_name,
+                    'arguments': tool_args,
+                    'result': tool_result
+                })
+                
+                # Store detailed results for collapsible display in UI
+                if tool_result.get('success'):
+                    self._tool_results.append({
                         'tool_name': tool_name,
-                        'arguments': tool_args,
-                        'result': tool_result
+                        'summary': tool_result.get('message', 'Tool executed successfully'),
+                        'data': tool_result.get('data', {}),
+                        'success': True
                     })
-                    
-                    # Store detailed results for collapsible display in UI
-                    if not hasattr(self, '_tool_results'):
-                        self._tool_results = []
-                    
-                    if tool_result.get('success'):
-                        self._tool_results.append({
-                            'tool_name': tool_name,
-                            'summary': tool_result.get('message', 'Tool executed successfully'),
-                            'data': tool_result.get('data', {}),
-                            'success': True
-                        })
-                        tool_result_content = self._format_tool_result_for_gpt(tool_result)
-                    else:
-                        self._tool_results.append({
-                            'tool_name': tool_name,
-                            'summary': f"Tool failed: {tool_result.get('error', 'Unknown error')}",
-                            'data': {},
-                            'success': False
-                        })
-                        tool_result_content = f"Tool execution failed: {tool_result.get('error', 'Unknown error')}"
-                    
-                    # Add tool result to conversation history (OpenAI standard)
-                    self.conversation_history.append({
-                        "role": "tool",
-                        "content": tool_result_content,
-                        "tool_call_id": tool_call_id
+                    tool_result_content = self._format_tool_result_for_gpt(tool_result)
+                else:
+                    self._tool_results.append({
+                        'tool_name': tool_name,
+                        'summary': f"Tool failed: {tool_result.get('error', 'Unknown error')}",
+                        'data': {},
+                        'success': False
                     })
+                    tool_result_content = f"Tool execution failed: {tool_result.get('error', 'Unknown error')}"
+                
+                # Add tool result to conversation history (OpenAI standard)
+                self._history.append({
+                    "role": "tool",
+                    "content": tool_result_content,
+                    "tool_call_id": tool_call_id
+                })
             
             # STEP 3: Add user message to prompt GPT to continue
-            self.conversation_history.append({
+            self._history.append({
                 "role": "user",
                 "content": "Continue with the analysis. If you need to call more tools to complete the user's request, do so. If the analysis is complete, provide your final response."
             })
-            self.conversation_logger.info(f"ADDED USER CONTINUE MESSAGE AFTER API CALL #{api_call_count}")
+            trace.info("ADDED USER CONTINUE MESSAGE AFTER API CALL #%d", api_call_count)
             self._log_conversation_state(f"After tool execution round {api_call_count}")
             
             # STEP 4: Make next API call
             api_call_count += 1
-            self.logger.info(f"Making API call #{api_call_count}")
-            self.conversation_logger.info(f"MAKING API CALL #{api_call_count}")
+            self.logger.info("Making API call #%d", api_call_count)
+            trace.info("MAKING API CALL #%d", api_call_count)
             
-            current_result = self.client.create_response(
-                messages=self.conversation_history,
+            current_result = await self._create_response(
+                messages=self._messages(),
                 use_case=config.get("purpose", "general_assistant"),
                 custom_config=config
             )
             
             # Log API call result
-            self.conversation_logger.info(f"API CALL #{api_call_count} RESULT:")
-            self.conversation_logger.info(f"  Success: {current_result.get('success')}")
-            self.conversation_logger.info(f"  Content length: {len(current_result.get('content', ''))}")
-            self.conversation_logger.info(f"  Has tool calls: {bool(current_result.get('metadata', {}).get('tool_calls'))}")
+            trace.info("API CALL #%d RESULT:", api_call_count)
+            trace.info("  Success: %s", current_result.get('success'))
+            trace.info("  Content length: %d", len(current_result.get('content', '')))
+            trace.info("  Has tool calls: %s", bool(current_result.get('metadata', {}).get('tool_calls')))
             
             if not current_result.get('success'):
                 # API call failed
                 error_msg = f"API call #{api_call_count} failed: {current_result.get('error', 'Unknown error')}"
-                self.conversation_logger.info(f"ERROR: {error_msg}")
-                self.conversation_history.append({
+                trace.info("ERROR: %s", error_msg)
+                self._history.append({
                     "role": "assistant",
                     "content": f"I executed tools successfully, but encountered an error in follow-up processing: {current_result.get('error', 'Unknown error')}"
                 })
                 return f"Tool execution completed, but processing error occurred: {current_result.get('error', 'Unknown error')}"
         
         # Max iterations reached
-        self.conversation_logger.info(f"MAX ITERATIONS ({max_iterations}) REACHED - Stopping tool calling loop")
+        trace.info("MAX ITERATIONS (%d) REACHED - Stopping tool calling loop", max_iterations)
         final_content = f"Completed tool execution after {max_iterations} rounds, but the analysis workflow is still requesting more tools. Please check the tool results above."
-        self.conversation_history.append({
+        self._history.append({
             "role": "assistant",
             "content": final_content
         })
@@ -353,49 +615,32 @@ class LLMChatbox:
     
     def _load_config(self) -> Dict:
         """Load chatbox configuration"""
-        config_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)), 
-            'config', 
-            'llm_chatbox_config.json'
-        )
+        config_path = _CHATBOX_CONFIG_PATH
         
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            # Shallow copy: top-level keys stay per instance, nested sections are shared
+            return dict(_load_chatbox_config(config_path, os.stat(config_path).st_mtime_ns))
         except FileNotFoundError:
             self.logger.error(f"Chatbox config not found at {config_path}")
             return self._default_config()
     
     def _default_config(self) -> Dict:
         """Default configuration if config file is missing"""
-        return {
-            "purpose": "general_assistant",
-            "config": {
-                "text": {"format": {"type": "text"}, "verbosity": "high"},
-                "reasoning": {"effort": "medium", "summary": "auto"},
-                "tools": [],
-                "store": True,
-                "include": ["reasoning.encrypted_content"]
-            },
-            "system_prompt": "You are a helpful AI assistant for laboratory management.",
-            "conversation_settings": {
-                "max_exchanges": 50,
-                "context_window": 10,
-                "enable_reasoning_display": True
-            },
-            "ui_settings": {
-                "title": "AI Assistant",
-                "placeholder_text": "Ask me anything...",
-                "suggested_prompts": ["Help me with research questions"]
-            }
-        }
+        return dict(_DEFAULT_CHATBOX_CONFIG)
+    
+    @classmethod
+    def clear_config_cache(cls):
+        """Drop the parsed chatbox config, so the next chatbox re-reads the file"""
+        _load_chatbox_config.cache_clear()
     
     def _initialize_mcp(self):
         """Initialize MCP client and tools"""
+        get_mcp_client = _mcp_client_factory()
+        if get_mcp_client is None:
+            self.mcp_client = None
+            return
+        
         try:
-            # Import MCP client here to avoid circular imports
-            from ..mcp.client import get_mcp_client
-            
             self.mcp_client = get_mcp_client()
             self.logger.info("MCP client initialized")
             
@@ -417,43 +662,46 @@ class LLMChatbox:
         else:
             enhanced_prompt = system_prompt
         
-        self.conversation_history = [
-            {
-                "role": "system",
-                "content": enhanced_prompt
-            }
-        ]
+        self._system_msg = {
+            "role": "system",
+            "content": enhanced_prompt
+        }
+        self._history = deque()
+        self._logged_count = 0
+        self.conversation_logger.info("SYSTEM PROMPT: %d chars", len(enhanced_prompt))
+    
+    def _messages(self) -> List[Dict[str, Any]]:
+        """System message followed by the conversation history, as sent to the API"""
+        return [self._system_msg, *self._history]
+    
+    @property
+    def conversation_history(self) -> List[Dict[str, Any]]:
+        """Conversation as a list starting with the system message (a new list on each access)"""
+        return self._messages()
     
     def _get_tools_context(self) -> str:
         """Get MCP tools context for system prompt"""
-        mcp_config = self.config.get("mcp_integration", {})
+        if self._tools_context_cache is not None:
+            return self._tools_context_cache
         
-        tools_context = """
-## Available Tools
-
-You have access to the following MCP tools for ArXiv Daily reports:
-
-"""
+        mcp_config = self.config.get("mcp_integration", {})
+        parts = [_TOOLS_CONTEXT_HEADER]
         
         # Add active ArXiv Daily tools
         arxiv_tools = mcp_config.get("arxiv_daily_tools", [])
         if arxiv_tools:
-            tools_context += "### ArXiv Daily Tools (Active)\n"
-            for tool in arxiv_tools:
-                if tool.get("status") == "active":
-                    tools_context += f"- **{tool['name']}**: {tool['description']}\n"
-            tools_context += "\n"
+            parts.append("### ArXiv Daily Tools (Active)\n")
+            parts.extend(
+                f"- **{tool['name']}**: {tool['description']}\n"
+                for tool in arxiv_tools if tool.get("status") == "active"
+            )
+            parts.append("\n")
         
         # Add usage instructions
-        tools_context += """### Tool Usage
-When users ask about ArXiv papers, reports, or want to generate new reports, you can:
-- Use `read_daily_report` to read existing reports and provide analysis
-- Use `generate_daily_report` to create new daily reports
-- Use `list_available_reports` to show available reports
-
-Always provide helpful context and summaries when using these tools.
-"""
+        parts.append(_TOOLS_CONTEXT_USAGE)
+        tools_context = "".join(parts)
         
+        self._tools_context_cache = tools_context
         return tools_context
     
     def _prepare_tools_for_llm(self) -> List[Dict[str, Any]]:
@@ -469,6 +717,18 @@ Always provide helpful context and summaries when using these tools.
         # Check what model we're using to format tools correctly
         model = self.config.get("model", "gpt-4.1")
         
+        # Reuse the previous payload while the tool set and model are unchanged. The cached
+        # payload holds the schemas, so their ids cannot be reused while they are in the key.
+        key = (model, tuple(
+            (tool.get("name"), tool.get("description"), id(tool.get("inputSchema", tool.get("parameters"))))
+            for tool in available_tools if isinstance(tool, dict)
+        ))
+        if self._tools_payload_cache and self._tools_payload_cache[0] == key:
+            return self._tools_payload_cache[1]
+        
+        # GPT-5 models use the Responses API tool format
+        responses_api = model.startswith("gpt-5")
+        
         for tool in available_tools:
             # Handle both regular MCP tools and FastMCP tools
             if isinstance(tool, dict) and "name" in tool:
@@ -480,7 +740,7 @@ Always provide helpful context and summaries when using these tools.
                     "required": []
                 }))
                 
-                if model.startswith("gpt-5"):
+                if responses_api:
                     # Responses API format (simpler format)
                     llm_tool = {
                         "type": "function",
@@ -500,8 +760,44 @@ Always provide helpful context and summaries when using these tools.
                     }
                 llm_tools.append(llm_tool)
         
+        self._tools_payload_cache = (key, llm_tools)
         return llm_tools
     
+    async def _get_prepared_tools(self) -> List[Dict[str, Any]]:
+        """Prepared MCP tools, coalesced across concurrent chats and cached for TOOLS_CACHE_TTL seconds"""
+        if not self.mcp_client:
+            return []
+        
+        # Activating or deactivating a tool rewrites the state file, which changes the key
+        key = (id(self.mcp_client), self.config.get("model", "gpt-4.1"), activation_state_version())
+        cached = self._tools_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.TOOLS_CACHE_TTL:
+            return cached[1]
+        
+        loop = asyncio.get_running_loop()
+        inflight = self._tools_inflight.get(key)
+        if inflight is not None and inflight.get_loop() is loop:
+            return await asyncio.shield(inflight)
+        
+        future = loop.run_in_executor(None, self._prepare_tools_for_llm)
+        self._tools_inflight[key] = future
+        try:
+            tools = await future
+        finally:
+            if self._tools_inflight.get(key) is future:
+                del self._tools_inflight[key]
+        
+        # Keep only the current entry per chatbox config, so superseded activation states are dropped
+        for stale_key in [k for k in self._tools_cache if k[:2] == key[:2] and k != key]:
+            del self._tools_cache[stale_key]
+        self._tools_cache[key] = (time.monotonic(), tools)
+        return tools
+    
+    async def _create_response(self, **kwargs) -> Dict[str, Any]:
+        """Run the blocking LLM client call in a worker thread so the event loop stays responsive"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self.client.create_response, **kwargs))
+    
     async def _execute_tool_call(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Execute an MCP tool call"""
         if not self.mcp_client:
@@ -552,68 +848,76 @@ Always provide helpful context and summaries when using these tools.
         """Send a message to GPT-5-mini and get response"""
         try:
             # Add user message to history
-            self.conversation_history.append({
+            self._history.append({
                 "role": "user",
                 "content": user_message
             })
             
             # Log user message
-            self.conversation_logger.info(f"USER MESSAGE: {user_message}")
+            self.conversation_logger.info("USER MESSAGE: %s", user_message)
             self._log_conversation_state("After adding user message")
             
-            # Prepare custom config with tools if MCP is enabled
-            custom_config = self.config.get("config", {}).copy()
+            # Per-turn settings, looked up once
+            mcp_enabled = bool(self.mcp_client) and (self.config.get("mcp_integration") or {}).get("enabled", False)
+            purpose = self.config.get("purpose", "general_assistant")
             
-            if self.mcp_client and self.config.get("mcp_integration", {}).get("enabled", False):
+            # Read-only base config; the tools overlay below is the only per-turn allocation
+            custom_config = self._base_config
+            
+            if mcp_enabled:
                 # Add MCP tools to the config
-                mcp_tools = self._prepare_tools_for_llm()
+                mcp_tools = await self._get_prepared_tools()
                 if mcp_tools:
-                    custom_config["tools"] = mcp_tools
-                    # Extract tool names for logging (handle both formats)
-                    tool_names = []
-                    for t in mcp_tools:
-                        if 'function' in t:
-                            tool_names.append(t['function']['name'])
-                        else:
-                            tool_names.append(t['name'])
-                    self.logger.info(f"🔧 Added {len(mcp_tools)} tools to LLM request: {tool_names}")
+                    custom_config = {**self._base_config, "tools": mcp_tools}
+                    if self.logger.isEnabledFor(logging.INFO):
+                        # Extract tool names for logging (handle both formats)
+                        tool_names = [
+                            t['function']['name'] if 'function' in t else t['name']
+                            for t in mcp_tools
+                        ]
+                        self.logger.info("🔧 Added %d tools to LLM request: %s", len(mcp_tools), tool_names)
                 else:
                     self.logger.warning("⚠️  No MCP tools available to add to request")
             
             # Log API call details
-            self.conversation_logger.info(f"MAKING API CALL #1 - Model: {custom_config.get('model', 'default')}")
-            self.conversation_logger.info(f"Tools available: {len(custom_config.get('tools', []))}")
+            self.conversation_logger.info("MAKING API CALL #1 - Model: %s", custom_config.get('model', 'default'))
+            self.conversation_logger.info("Tools available: %d", len(custom_config.get('tools', [])))
             
             # Create response using LLM client
-            result = self.client.create_response(
-                messages=self.conversation_history,
-                use_case=self.config.get("purpose", "general_assistant"),
+            result = await self._create_response(
+                messages=self._messages(),
+                use_case=purpose,
                 custom_config=custom_config
             )
             
             # Log API response
-            self.conversation_logger.info(f"API CALL #1 RESPONSE - Success: {result['success']}")
+            self.conversation_logger.info("API CALL #1 RESPONSE - Success: %s", result['success'])
             if result['success']:
-                self.conversation_logger.info(f"Content: {result['content'][:200]}...")
-                self.conversation_logger.info(f"Tool calls detected: {bool(result.get('metadata', {}).get('tool_calls'))}")
+                self.conversation_logger.info("Content: %.200s...", result['content'])
+                self.conversation_logger.info("Tool calls detected: %s", bool(result.get('metadata', {}).get('tool_calls')))
             
             if result['success']:
                 # Handle tool calls using proper OpenAI pattern
                 response_content = result['content']
                 tool_call_results = []
                 
-                # Look for tool calls in the response metadata
-                self.logger.info(f"Response received, tool calls: {bool(result.get('metadata', {}).get('tool_calls'))}")
+                # Without MCP no tools were offered, so the first reply is final
+                if mcp_enabled:
+                    # Look for tool calls in the response metadata
+                    tool_calls = (result.get('metadata') or {}).get('tool_calls')
+                    self.logger.info("Response received, tool calls: %s", bool(tool_calls))
+                else:
+                    tool_calls = None
                 
-                if result.get('metadata') and result['metadata'].get('tool_calls'):
+                if tool_calls:
                     # Handle iterative tool calling until no more tool calls are made
                     response_content = await self._handle_iterative_tool_calling(
                         result, custom_config, tool_call_results
                     )
                 else:
                     # No tool calls - direct response from LLM
-                    self.logger.info(f"ℹ️ Direct response from LLM (no tool calls)")
-                    self.conversation_history.append({
+                    self.logger.info("ℹ️ Direct response from LLM (no tool calls)")
+                    self._history.append({
                         "role": "assistant",
                         "content": response_content
                     })
@@ -623,11 +927,11 @@ Always provide helpful context and summaries when using these tools.
                 self._log_conversation_state("Final conversation state")
                 
                 # Get tool results and reset for next conversation
-                current_tool_results = getattr(self, '_tool_results', [])
+                current_tool_results = self._tool_results
                 self._tool_results = []  # Reset for next conversation
                 
                 # Log successful completion
-                self.conversation_logger.info(f"CHAT COMPLETED SUCCESSFULLY - Response length: {len(response_content)} chars")
+                self.conversation_logger.info("CHAT COMPLETED SUCCESSFULLY - Response length: %d chars", len(response_content))
                 self.conversation_logger.info("=" * 50)
                 
                 return {
@@ -637,7 +941,7 @@ Always provide helpful context and summaries when using these tools.
                     "metadata": result.get('metadata', {}),
                     "tool_calls": tool_call_results,
                     "tool_results": current_tool_results,
-                    "conversation_length": len(self.conversation_history) - 1  # Exclude system message
+                    "conversation_length": len(self._history)  # System message is kept separately
                 }
             else:
                 return {
@@ -665,20 +969,26 @@ Always provide helpful context and summaries when using these tools.
         max_exchanges = self.config.get("conversation_settings", {}).get("max_exchanges", 50)
         context_window = self.config.get("conversation_settings", {}).get("context_window", 10)
         
-        # Keep system message + last N exchanges (each exchange = user + assistant message)
-        if len(self.conversation_history) > 1 + (context_window * 2):
-            # Keep system message + last context_window exchanges
-            self.conversation_history = [self.conversation_history[0]] + self.conversation_history[-(context_window * 2):]
+        # Keep the last N exchanges (each exchange = user + assistant message); the
+        # system message is pinned separately. Evicting from the left is O(1) per message
+        # and, unlike a deque maxlen, never drops messages from the turn in progress.
+        history = self._history
+        while len(history) > context_window * 2:
+            history.popleft()
+            # Keep the trace position pointing at the same message
+            if self._logged_count:
+                self._logged_count -= 1
     
     def clear_conversation(self):
         """Clear conversation history and start fresh"""
         self._initialize_conversation()
+        self._tool_results = []
         self.logger.info("Conversation history cleared")
     
     def get_conversation_summary(self) -> Dict[str, Any]:
         """Get summary of current conversation"""
-        # Exclude system message from count
-        message_count = len(self.conversation_history) - 1
+        # System message is kept separately, so it is not counted
+        message_count = len(self._history)
         exchanges = message_count // 2
         
         return {
@@ -711,35 +1021,30 @@ Always provide helpful context and summaries when using these tools.
         enabled = mcp_config.get("enabled", False)
         
         if enabled:
+            # Activations are re-read only after the state file changes
+            cache_key = (activation_state_version(), self.mcp_client is not None)
+            if self._mcp_info_cache and self._mcp_info_cache[0] == cache_key:
+                return copy.deepcopy(self._mcp_info_cache[1])
+            
             # Check activation status using ToolManager
             tool_manager = ToolManager()
+            arxiv_active = tool_manager.is_tool_active("arxiv_daily")
+            flake_active = tool_manager.is_tool_active("flake_2d")
             
-            # Only include tools that are currently activated
-            arxiv_tools = []
-            flake_tools = []
-            
-            if tool_manager.is_tool_active("arxiv_daily"):
-                arxiv_tools = mcp_config.get("arxiv_daily_tools", [])
+            # Get activation summary for additional info
+            activation_summary = tool_manager.get_activation_summary()
             
-            if tool_manager.is_tool_active("flake_2d"):
-                flake_tools = mcp_config.get("flake_2d_tools", [])
+            # Only include tools that are currently activated
+            arxiv_tools = mcp_config.get("arxiv_daily_tools", []) if arxiv_active else []
+            flake_tools = mcp_config.get("flake_2d_tools", []) if flake_active else []
             
             planned_tools = mcp_config.get("planned_tools", [])
             
-            # Combine active tools from both categories
-            all_active_tools = []
-            
-            # Add ArXiv tools with category label (only if activated)
-            for tool in arxiv_tools:
-                tool_with_category = tool.copy()
-                tool_with_category["category"] = "ArXiv Daily"
-                all_active_tools.append(tool_with_category)
-            
-            # Add 2D flake tools with category label (only if activated)
-            for tool in flake_tools:
-                tool_with_category = tool.copy()
-                tool_with_category["category"] = "2D Flake Classification"
-                all_active_tools.append(tool_with_category)
+            # Combine active tools from both categories, labelled by category
+            all_active_tools = (
+                [{**tool, "category": "ArXiv Daily"} for tool in arxiv_tools]
+                + [{**tool, "category": "2D Flake Classification"} for tool in flake_tools]
+            )
             
             # Build status message based on actually active tools
             status_parts = []
@@ -753,10 +1058,7 @@ Always provide helpful context and summaries when using these tools.
             else:
                 status = "MCP integration enabled but no tools are activated"
             
-            # Get activation summary for additional info
-            activation_summary = tool_manager.get_activation_summary()
-            
-            return {
+            info = {
                 "enabled": True,
                 "active_tools": all_active_tools,
                 "arxiv_tools": arxiv_tools,
@@ -766,6 +1068,9 @@ Always provide helpful context and summaries when using these tools.
                 "mcp_client_available": self.mcp_client is not None,
                 "activation_summary": activation_summary
             }
+            self._mcp_info_cache = (cache_key, info)
+            # Callers get their own copy, so the cached payload cannot be changed
+            return copy.deepcopy(info)
         else:
             return {
                 "enabled": False,
@@ -848,78 +1153,10 @@ Always provide helpful context and summaries when using these tools.
             
             # Format different types of data (existing ArXiv formatting)
             for key, value in data.items():
-                if key == 'high_priority_papers' and isinstance(value, list):
-                    content_parts.append(f"\nHigh Priority Papers ({len(value)} papers):")
-                    for i, paper in enumerate(value, 1):
-                        if isinstance(paper, dict):
-                            title = paper.get('title', 'N/A')
-                            authors = paper.get('authors', 'N/A') 
-                            abstract = paper.get('abstract', 'N/A')[:200] + "..." if len(paper.get('abstract', '')) > 200 else paper.get('abstract', 'N/A')
-                            reason = paper.get('ai_assessment', 'N/A')
-                            
-                            content_parts.append(f"\n{i}. Title: {title}")
-                            content_parts.append(f"   Authors: {authors}")
-                            content_parts.append(f"   Abstract: {abstract}")
-                            content_parts.append(f"   AI Assessment: {reason}")
-                
-                elif key == 'search_results' and isinstance(value, dict):
-                    # Handle search results from search_papers_by_author
-                    matching_papers = value.get('matching_papers', [])
-                    total_searched = value.get('total_papers_searched', 0)
-                    content_parts.append(f"\nAuthor Search Results:")
-                    content_parts.append(f"Papers searched: {total_searched}")
-                    content_parts.append(f"Papers found: {len(matching_papers)}")
-                    
-                    if matching_papers:
-                        content_parts.append(f"\nMatching Papers:")
-                        for i, paper in enumerate(matching_papers, 1):
-                            if isinstance(paper, dict):
-                                title = paper.get('title', 'N/A')
-                                authors = paper.get('authors', 'N/A')
-                                abstract = paper.get('abstract', 'N/A')[:200] + "..." if len(paper.get('abstract', '')) > 200 else paper.get('abstract', 'N/A')
-                                priority = paper.get('priority', 'N/A')
-                                reason = paper.get('ai_assessment', 'N/A')
-                                
-                                content_parts.append(f"\n{i}. Title: {title}")
-                                content_parts.append(f"   Authors: {authors}")
-                                content_parts.append(f"   Priority: {priority}")
-                                content_parts.append(f"   Abstract: {abstract}")
-                                content_parts.append(f"   AI Assessment: {reason}")
-                
-                elif key == 'search_query' and isinstance(value, dict):
-                    # Handle search query info
-                    author_name = value.get('author_name', 'N/A')
-                    match_type = value.get('match_type', 'N/A')
-                    date = value.get('date', 'N/A')
-                    content_parts.append(f"\nSearch Query:")
-                    content_parts.append(f"Author: {author_name}")
-                    content_parts.append(f"Match Type: {match_type}")
-                    content_parts.append(f"Report Date: {date}")
-                
-                elif key == 'reports' and isinstance(value, list):
-                    content_parts.append(f"\nAvailable Reports ({len(value)} reports):")
-                    for report in value:
-                        if isinstance(report, dict):
-                            date = report.get('date', 'N/A')
-                            total = report.get('total_papers', 0)
-                            priority_3 = report.get('priority_3_count', 0)
-                            content_parts.append(f"- {date}: {total} papers ({priority_3} high priority)")
-                
-                elif key == 'summary' and isinstance(value, dict):
-                    content_parts.append(f"\nSummary:")
-                    for summary_key, summary_value in value.items():
-                        formatted_key = summary_key.replace('_', ' ').title()
-                        content_parts.append(f"- {formatted_key}: {summary_value}")
-                
-                else:
-                    # Generic formatting for other data types
-                    if isinstance(value, (dict, list)):
-                        content_parts.append(f"\n{key.replace('_', ' ').title()}: {str(value)}")
-                    else:
-                        content_parts.append(f"\n{key.replace('_', ' ').title()}: {value}")
+                content_parts.extend(_FORMATTERS.get(key, _format_generic)(value, key))
         
         elif isinstance(data, list):
-            content_parts.append(f"\nData ({len(data)} items): {str(data)}")
+            content_parts.append(f"\nData ({len(data)} items): {fast_json.dumps(data, default=str)}")
         else:
             content_parts.append(f"\nData: {str(data)}")
         
@@ -1,37 +1,232 @@
-import json
+import asyncio
+import functools
+import hashlib
 import logging
 import os
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
-from ..utils import Config
+import sqlite3
+import threading
+import time
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple, Union
+import httpx
+from openai import AsyncOpenAI, OpenAI
+from ..utils import Config, fast_json
+
+
+logger = logging.getLogger("tools.llm_client")
+
+_LLM_CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 
+    'config', 
+    'llm_config.json'
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_llm_config_file(path: str, mtime_ns: int) -> Dict:
+    """Parse an LLM config file; mtime is part of the key so edits are picked up"""
+    with open(path, 'rb') as f:
+        return fast_json.loads(f.read())
+
+
+_MISSING = object()
+
+
+def _on_message(item, parsed: Dict[str, Any]) -> None:
+    # The first text of the first message item is the response content
+    if parsed["content"] is _MISSING:
+        texts = (getattr(content_item, 'text', _MISSING) for content_item in getattr(item, 'content', None) or ())
+        parsed["content"] = next((text for text in texts if text is not _MISSING), _MISSING)
+
+
+def _on_reasoning(item, parsed: Dict[str, Any]) -> None:
+    if parsed["reasoning"] is not None:
+        return
+    summary = getattr(item, 'summary', None)
+    if summary:
+        if isinstance(summary, list):
+            # Combine all summary texts
+            summary = "\n".join(
+                summary_item.text for summary_item in summary if hasattr(summary_item, 'text')
+            )
+        else:
+            summary = str(summary)
+    else:
+        summary = None
+    parsed["reasoning"] = {
+        "available": True,
+        "summary": summary,
+        "encrypted_content": getattr(item, 'encrypted_content', None)
+    }
+
+
+def _on_function_call(item, parsed: Dict[str, Any]) -> None:
+    # Direct function call in responses API; arguments arrive as a JSON string
+    arguments = getattr(item, 'arguments', '{}')
+    if isinstance(arguments, str):
+        try:
+            arguments = fast_json.loads(arguments)
+        except ValueError:
+            pass
+    parsed["tool_calls"].append({
+        'id': getattr(item, 'call_id', getattr(item, 'id', '')),
+        'name': getattr(item, 'name', ''),
+        'arguments': arguments
+    })
+
+
+def _on_legacy_tool_calls(item, parsed: Dict[str, Any]) -> None:
+    # Legacy format: tool_calls array
+    for tool_call in getattr(item, 'tool_calls', None) or ():
+        if hasattr(tool_call, 'name'):
+            parsed["tool_calls"].append({
+                'id': getattr(tool_call, 'id', ''),
+                'name': tool_call.name,
+                'arguments': getattr(tool_call, 'arguments', {})
+            })
+        elif hasattr(tool_call, 'function'):
+            # Fallback to function format
+            parsed["tool_calls"].append({
+                'id': getattr(tool_call, 'id', ''),
+                'name': tool_call.function.name,
+                'arguments': getattr(tool_call.function, 'arguments', {})
+            })
+
+
+# Responses API output item type -> handler collecting it into the parsed result
+_OUTPUT_HANDLERS = {
+    'message': _on_message,
+    'reasoning': _on_reasoning,
+    'function_call': _on_function_call,
+    'tool_calls': _on_legacy_tool_calls,
+}
+
+
+# System messages shared by every scoring / analysis request; never mutated
+_SCORING_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are an expert research paper evaluator for a 2D materials physics laboratory."
+}
+_ANALYSIS_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are an expert research analyst specializing in condensed matter physics and 2D materials."
+}
+
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+
+def _responses_fields(config: Dict) -> Dict[str, Any]:
+    """Responses API parameters taken from a config, with defaults filled in"""
+    fields = {
+        "text": config.get("text", {
+            "format": {"type": "text"},
+            "verbosity": "medium"
+        }),
+        "reasoning": config.get("reasoning", {
+            "effort": "medium",
+            "summary": "auto"
+        }),
+        "tools": config.get("tools", []),
+        "store": config.get("store", True)
+    }
+    if "include" in config:
+        fields["include"] = config["include"]
+    return fields
+
+
+# Batch job states after which no more results will arrive
+_BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+_RESPONSE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "labagent", "llm_responses.sqlite")
+_RESPONSE_CACHE_TTL = 7 * 24 * 3600
+
+
+class _ResponseCache:
+    """On-disk cache of successful results for idempotent requests such as paper scoring"""
+    
+    def __init__(self, path: str, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, expires REAL, result TEXT)"
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def key(model: str, config: Dict, messages: List[Dict[str, str]]) -> str:
+        payload = fast_json.dumps({"model": model, "config": config, "input": messages}, sort_keys=True)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=32).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM responses WHERE key = ? AND expires > ?", (key, time.time())
+            ).fetchone()
+        return fast_json.loads(row[0]) if row else None
+    
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                (key, time.time() + self.ttl, fast_json.dumps(result, default=str))
+            )
+            self._conn.commit()
 
 
 class LLMClient:
     """Client wrapper for OpenAI LLM models (GPT-4.1, GPT-5, etc.)"""
     
+    __slots__ = (
+        "config", "client", "llm_config", "_use_case_configs", "_loop_resources",
+        "_loop_resources_lock", "max_concurrent_requests", "_response_cache", "_response_cache_lock",
+        "_prepared_fields",
+    )
+    
     def __init__(self):
-        self.logger = logging.getLogger("tools.llm_client")
         self.config = Config()
         
         if not self.config.openai_api_key:
             raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY in your .env file")
         
-        self.client = OpenAI(api_key=self.config.openai_api_key)
+        # Explicit keep-alive pools, so warm connections are reused across requests
+        self.client = OpenAI(
+            api_key=self.config.openai_api_key,
+            http_client=httpx.Client(limits=_HTTP_LIMITS)
+        )
         self.llm_config = self._load_llm_config()
+        # Default config merged with each use case, built once instead of per request
+        default_config = self.llm_config["default_config"]
+        self._use_case_configs = {
+            use_case: {**default_config, **use_case_config}
+            for use_case, use_case_config in self.llm_config.get("use_cases", {}).items()
+        }
+        # Responses API fields of those configs, keyed by id(); the configs live as long as
+        # the client, so the ids stay unique. Custom configs are still read per request.
+        self._prepared_fields = {
+            id(prepared_config): _responses_fields(prepared_config)
+            for prepared_config in (default_config, *self._use_case_configs.values())
+        }
+        
+        # Cap on in-flight async requests, so large fan-outs stay under the rate limit
+        self.max_concurrent_requests = self.llm_config.get("max_concurrent_requests", 8)
+        # Async client and request semaphore per event loop, created on first use (see aclient)
+        self._loop_resources: Dict[asyncio.AbstractEventLoop, Tuple[AsyncOpenAI, asyncio.Semaphore]] = {}
+        self._loop_resources_lock = threading.Lock()
+        
+        # Results of idempotent requests (create_response(..., cache=True)) persist across runs.
+        # The cache file is opened by the first such request; False once opening it failed.
+        self._response_cache: Union[None, bool, _ResponseCache] = None
+        self._response_cache_lock = threading.Lock()
         
     def _load_llm_config(self) -> Dict:
-        """Load LLM-specific configuration"""
-        config_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)), 
-            'config', 
-            'llm_config.json'
-        )
+        """Load LLM-specific configuration (shared between clients; treat as read-only)"""
+        config_path = _LLM_CONFIG_PATH
         
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _load_llm_config_file(config_path, os.stat(config_path).st_mtime_ns)
         except FileNotFoundError:
-            self.logger.error(f"GPT-5-mini config not found at {config_path}")
+            logger.error(f"GPT-5-mini config not found at {config_path}")
             return self._default_config()
     
     def _default_config(self) -> Dict:
@@ -58,7 +253,8 @@ class LLMClient:
         messages: List[Dict[str, str]], 
         use_case: str = "default",
         custom_config: Optional[Dict] = None,
-        model: str = None
+        model: str = None,
+        cache: bool = False
     ) -> Dict[str, Any]:
         """
         Create a response using appropriate API for the model
@@ -68,164 +264,334 @@ class LLMClient:
             use_case: Configuration preset to use ('paper_scoring', 'chat_conversation', 'research_analysis')
             custom_config: Override default configuration
             model: Model to use (e.g., 'gpt-4.1', 'gpt-5-mini')
+            cache: Reuse a stored result for the same model, config and messages.
+                Only for idempotent requests such as scoring, not conversations.
         """
         try:
-            # Get configuration
-            if custom_config:
-                config = custom_config
-            elif use_case in self.llm_config.get("use_cases", {}):
-                base_config = self.llm_config["default_config"].copy()
-                use_case_config = self.llm_config["use_cases"][use_case]
-                base_config.update(use_case_config)
-                config = base_config
-            else:
-                config = self.llm_config["default_config"]
+            config = self._resolve_config(use_case, custom_config)
             
             # Determine model to use
             model_name = model or config.get("model", "gpt-4.1")
             
+            cache_key = self._cache_key(cache, model_name, config, messages)
+            if cache_key is not None:
+                cached = self._response_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            
             # Choose API based on model type
             if model_name.startswith("gpt-5"):
                 # GPT-5 series uses responses API
-                return self._create_responses_api(messages, model_name, config)
+                result = self._create_responses_api(messages, model_name, config)
             else:
                 # GPT-4.1 and other models use chat completions API
-                return self._create_chat_completion(messages, model_name, config)
+                result = self._create_chat_completion(messages, model_name, config)
+            
+            self._store_cached(cache_key, result)
+            return result
                 
         except Exception as e:
-            self.logger.error(f"Error creating response: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "content": "",
-                "metadata": {"error": "API call failed"}
-            }
+            return self._create_error(e)
     
-    def _create_chat_completion(self, messages: List[Dict[str, str]], model: str, config: Dict) -> Dict[str, Any]:
-        """Create response using chat completions API (for GPT-4.1, etc.)"""
+    async def acreate_response(
+        self, 
+        messages: List[Dict[str, str]], 
+        use_case: str = "default",
+        custom_config: Optional[Dict] = None,
+        model: str = None,
+        cache: bool = False
+    ) -> Dict[str, Any]:
+        """Async version of create_response; the request does not block the event loop"""
         try:
-            # Prepare API parameters for chat completions
-            api_params = {
-                "model": model,
-                "messages": messages,
-                "max_tokens": config.get("max_tokens", 4000),
-                "temperature": config.get("temperature", 0.7)
-            }
+            config = self._resolve_config(use_case, custom_config)
+            model_name = model or config.get("model", "gpt-4.1")
             
-            # Add tools if provided
-            tools = config.get("tools", [])
-            if tools:
-                api_params["tools"] = tools
-                api_params["tool_choice"] = "auto"
-                self.logger.info(f"🔧 Adding {len(tools)} tools to chat completion")
+            cache_key = self._cache_key(cache, model_name, config, messages)
+            if cache_key is not None:
+                cached = self._response_cache.get(cache_key)
+                if cached is not None:
+                    return cached
             
-            self.logger.info(f"Making chat completions API call with model: {model}")
-            self.logger.debug(f"API params: {api_params}")
+            async with self._request_slot():
+                if model_name.startswith("gpt-5"):
+                    result = await self._acreate_responses_api(messages, model_name, config)
+                else:
+                    result = await self._acreate_chat_completion(messages, model_name, config)
+            
+            self._store_cached(cache_key, result)
+            return result
+                
+        except Exception as e:
+            return self._create_error(e)
+    
+    async def astream_response(
+        self, 
+        messages: List[Dict[str, str]], 
+        use_case: str = "default",
+        custom_config: Optional[Dict] = None,
+        model: str = None
+    ) -> AsyncIterator[str]:
+        """Stream the response text, yielding deltas as they arrive instead of waiting for the full reply"""
+        config = self._resolve_config(use_case, custom_config)
+        model_name = model or config.get("model", "gpt-4.1")
+        
+        async with self._request_slot():
+            if model_name.startswith("gpt-5"):
+                api_params = self._responses_params(messages, model_name, config)
+                logger.info("Streaming responses API call with model: %s", model_name)
+                stream = await self.aclient.responses.create(**api_params, stream=True)
+                async for event in stream:
+                    if event.type == "response.output_text.delta":
+                        yield event.delta
+            else:
+                api_params = self._chat_completion_params(messages, model_name, config)
+                logger.info("Streaming chat completions API call with model: %s", model_name)
+                stream = await self.aclient.chat.completions.create(**api_params, stream=True)
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+    
+    @property
+    def aclient(self) -> AsyncOpenAI:
+        """Async client for the running event loop
+        
+        Its pooled connections belong to the loop they were opened on, and callers such
+        as the web app start a new loop per message with asyncio.run, so each loop gets
+        its own client. The SDK retries rate-limited (429) and 5xx responses with
+        exponential backoff, honouring Retry-After.
+        """
+        return self._loop_state()[0]
+    
+    def _request_slot(self) -> asyncio.Semaphore:
+        """Semaphore bounding concurrent async requests on the running loop"""
+        return self._loop_state()[1]
+    
+    def _loop_state(self) -> Tuple[AsyncOpenAI, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        state = self._loop_resources.get(loop)
+        if state is None:
+            with self._loop_resources_lock:
+                # Forget clients of finished loops; their connections cannot be reused
+                for closed_loop in [known for known in self._loop_resources if known.is_closed()]:
+                    del self._loop_resources[closed_loop]
+                state = (
+                    AsyncOpenAI(
+                        api_key=self.config.openai_api_key,
+                        max_retries=self.llm_config.get("max_retries", 6),
+                        http_client=httpx.AsyncClient(limits=_HTTP_LIMITS)
+                    ),
+                    asyncio.Semaphore(self.max_concurrent_requests)
+                )
+                self._loop_resources[loop] = state
+        return state
+    
+    def _resolve_config(self, use_case: str, custom_config: Optional[Dict]) -> Dict:
+        """Configuration for a request: the custom config, or defaults merged with the use case"""
+        if custom_config:
+            return custom_config
+        return self._use_case_configs.get(use_case) or self.llm_config["default_config"]
+    
+    def _cache_key(self, cache: bool, model: str, config: Dict, messages: List[Dict[str, str]]) -> Optional[str]:
+        """Response cache key for the request, or None when it should not be cached"""
+        if not cache or self._open_response_cache() is None:
+            return None
+        return _ResponseCache.key(model, config, messages)
+    
+    def _open_response_cache(self) -> Optional[_ResponseCache]:
+        """The response cache, opened on first use; None when it cannot be opened"""
+        if self._response_cache is None:
+            with self._response_cache_lock:
+                if self._response_cache is None:
+                    try:
+                        self._response_cache = _ResponseCache(
+                            self.llm_config.get("response_cache_path", _RESPONSE_CACHE_PATH),
+                            self.llm_config.get("response_cache_ttl", _RESPONSE_CACHE_TTL)
+                        )
+                    except (OSError, sqlite3.Error) as e:
+                        logger.warning(f"Response cache disabled: {e}")
+                        self._response_cache = False
+        return self._response_cache or None
+    
+    def _store_cached(self, cache_key: Optional[str], result: Dict[str, Any]) -> None:
+        # Only successful results are kept, so failures are retried on the next call
+        if cache_key is None or not result.get("success"):
+            return
+        try:
+            self._response_cache.set(cache_key, result)
+        except (TypeError, sqlite3.Error) as e:
+            logger.warning(f"Could not cache response: {e}")
+    
+    def _create_error(self, e: Exception) -> Dict[str, Any]:
+        logger.error(f"Error creating response: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "content": "",
+            "metadata": {"error": "API call failed"}
+        }
+    
+    def _create_chat_completion(self, messages: List[Dict[str, str]], model: str, config: Dict) -> Dict[str, Any]:
+        """Create response using chat completions API (for GPT-4.1, etc.)"""
+        try:
+            api_params = self._chat_completion_params(messages, model, config)
+            logger.info("Making chat completions API call with model: %s", model)
+            logger.debug("API params: %s", api_params)
             
             # Make the API call
             response = self.client.chat.completions.create(**api_params)
             
-            self.logger.info(f"✅ Chat completion response received, type: {type(response)}")
-            self.logger.debug(f"Response structure: {response}")
-            
-            # Extract response content and tool calls
-            message = response.choices[0].message
-            content = message.content or ""
-            tool_calls = message.tool_calls or []
-            
-            return {
-                "success": True,
-                "content": content,
-                "reasoning": None,  # Chat completions doesn't have reasoning
-                "metadata": {
-                    "model": model,
-                    "tool_calls": self._format_tool_calls_for_chat(tool_calls),
-                    "usage": response.usage.model_dump() if response.usage else None
-                }
-            }
+            return self._chat_completion_result(response, model)
             
         except Exception as e:
-            self.logger.error(f"Chat completions API error: {e}")
+            logger.error(f"Chat completions API error: {e}")
             raise
     
-    def _create_responses_api(self, messages: List[Dict[str, str]], model: str, config: Dict) -> Dict[str, Any]:
-        """Create response using responses API (for GPT-5 models)"""
+    async def _acreate_chat_completion(self, messages: List[Dict[str, str]], model: str, config: Dict) -> Dict[str, Any]:
         try:
-            # Prepare input from messages
-            input_data = []
-            for msg in messages:
-                input_data.append({
-                    "type": "message",
-                    "role": msg['role'],
-                    "content": msg['content']
-                })
+            api_params = self._chat_completion_params(messages, model, config)
+            logger.info("Making chat completions API call with model: %s", model)
+            logger.debug("API params: %s", api_params)
+            response = await self.aclient.chat.completions.create(**api_params)
+            return self._chat_completion_result(response, model)
             
-            # Prepare API parameters
-            api_params = {
+        except Exception as e:
+            logger.error(f"Chat completions API error: {e}")
+            raise
+    
+    def _chat_completion_params(self, messages: List[Dict[str, str]], model: str, config: Dict) -> Dict[str, Any]:
+        # Prepare API parameters for chat completions
+        api_params = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": config.get("max_tokens", 4000),
+            "temperature": config.get("temperature", 0.7)
+        }
+        
+        # Add tools if provided
+        tools = config.get("tools", [])
+        if tools:
+            api_params["tools"] = tools
+            api_params["tool_choice"] = "auto"
+            logger.info("🔧 Adding %d tools to chat completion", len(tools))
+        
+        return api_params
+    
+    def _chat_completion_result(self, response, model: str) -> Dict[str, Any]:
+        logger.info("✅ Chat completion response received, type: %s", type(response))
+        logger.debug("Response structure: %s", response)
+        
+        # Extract response content and tool calls
+        message = response.choices[0].message
+        content = message.content or ""
+        tool_calls = message.tool_calls or []
+        
+        return {
+            "success": True,
+            "content": content,
+            "reasoning": None,  # Chat completions doesn't have reasoning
+            "metadata": {
                 "model": model,
-                "input": input_data,
-                "text": config.get("text", {
-                    "format": {"type": "text"},
-                    "verbosity": "medium"
-                }),
-                "reasoning": config.get("reasoning", {
-                    "effort": "medium",
-                    "summary": "auto"
-                }),
-                "tools": config.get("tools", []),
-                "store": config.get("store", True)
+                "tool_calls": self._format_tool_calls_for_chat(tool_calls),
+                "usage": response.usage.model_dump() if response.usage else None
             }
-            
-            if "include" in config:
-                api_params["include"] = config["include"]
-            
-            self.logger.info(f"Making responses API call with model: {model}")
-            self.logger.debug(f"API params: {api_params}")
+        }
+    
+    def _create_responses_api(self, messages: List[Dict[str, str]], model: str, config: Dict) -> Dict[str, Any]:
+        """Create response using responses API (for GPT-5 models)"""
+        try:
+            api_params = self._responses_params(messages, model, config)
+            logger.info("Making responses API call with model: %s", model)
+            logger.debug("API params: %s", api_params)
             
             # Make the API call
             response = self.client.responses.create(**api_params)
             
-            self.logger.info(f"✅ Responses API response received, type: {type(response)}")
-            self.logger.debug(f"Response structure: {response}")
+            return self._responses_result(response, model, config)
             
-            return {
-                "success": True,
-                "content": self._extract_content(response),
-                "reasoning": self._extract_reasoning(response),
-                "metadata": {
-                    "model": model,
-                    "reasoning_effort": config.get("reasoning", {}).get("effort", "medium"),
-                    "tool_calls": self._extract_tool_calls(response)
-                }
-            }
+        except Exception as e:
+            return self._responses_error(e)
+    
+    async def _acreate_responses_api(self, messages: List[Dict[str, str]], model: str, config: Dict) -> Dict[str, Any]:
+        try:
+            api_params = self._responses_params(messages, model, config)
+            logger.info("Making responses API call with model: %s", model)
+            logger.debug("API params: %s", api_params)
+            response = await self.aclient.responses.create(**api_params)
+            return self._responses_result(response, model, config)
             
         except Exception as e:
-            self.logger.error(f"Responses API error: {e}")
-            import traceback
-            self.logger.error(f"Traceback: {traceback.format_exc()}")
-            return {
-                "success": False,
-                "error": str(e),
-                "content": "",
-                "metadata": {"error": "Responses API call failed"}
+            return self._responses_error(e)
+    
+    def _responses_params(self, messages: List[Dict[str, str]], model: str, config: Dict) -> Dict[str, Any]:
+        # Prepare input from messages; messages already in input shape are passed through
+        if all(msg.get('type') == "message" for msg in messages):
+            input_data = messages
+        else:
+            input_data = [
+                {"type": "message", "role": msg['role'], "content": msg['content']}
+                for msg in messages
+            ]
+        
+        fields = self._prepared_fields.get(id(config))
+        if fields is None:
+            fields = _responses_fields(config)
+        return {"model": model, "input": input_data, **fields}
+    
+    def _responses_result(self, response, model: str, config: Dict) -> Dict[str, Any]:
+        logger.info("✅ Responses API response received, type: %s", type(response))
+        logger.debug("Response structure: %s", response)
+        
+        parsed = self._parse_response(response)
+        return {
+            "success": True,
+            "content": parsed["content"],
+            "reasoning": parsed["reasoning"],
+            "metadata": {
+                "model": model,
+                "reasoning_effort": config.get("reasoning", {}).get("effort", "medium"),
+                "tool_calls": parsed["tool_calls"]
             }
+        }
+    
+    def _responses_error(self, e: Exception) -> Dict[str, Any]:
+        logger.error(f"Responses API error: {e}")
+        import traceback
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return {
+            "success": False,
+            "error": str(e),
+            "content": "",
+            "metadata": {"error": "Responses API call failed"}
+        }
     
-    def _extract_content(self, response) -> str:
-        """Extract text content from GPT-5-mini response"""
+    def _parse_response(self, response) -> Dict[str, Any]:
+        """Content, reasoning and tool calls of a GPT-5 response, collected in one pass over its output"""
+        parsed = {"content": _MISSING, "reasoning": None, "tool_calls": []}
+        try:
+            for item in getattr(response, 'output', None) or ():
+                handler = _OUTPUT_HANDLERS.get(getattr(item, 'type', None))
+                if handler is not None:
+                    handler(item, parsed)
+        except Exception as e:
+            logger.error(f"Could not parse response output: {e}")
+        
+        if parsed["content"] is _MISSING:
+            parsed["content"] = self._fallback_content(response, parsed["tool_calls"])
+        
+        # Fallback to direct reasoning attribute
+        if parsed["reasoning"] is None and hasattr(response, 'reasoning'):
+            parsed["reasoning"] = {
+                "available": True,
+                "summary": getattr(response.reasoning, 'summary', None),
+                "encrypted_content": getattr(response.reasoning, 'encrypted_content', None)
+            }
+        
+        logger.info("Extracted %d tool calls from response", len(parsed["tool_calls"]))
+        return parsed
+    
+    def _fallback_content(self, response, tool_calls: List[Dict]) -> str:
+        """Text content for responses without an output_text message"""
         try:
-            # GPT-5-mini returns Response object with output array
-            if hasattr(response, 'output') and response.output:
-                # Look for message type in output array
-                for item in response.output:
-                    if hasattr(item, 'type') and item.type == 'message':
-                        if hasattr(item, 'content') and item.content:
-                            # Content is an array of ResponseOutputText objects
-                            for content_item in item.content:
-                                if hasattr(content_item, 'type') and content_item.type == 'output_text':
-                                    return content_item.text
-                                elif hasattr(content_item, 'text'):
-                                    return content_item.text
-            
             # Fallback: try other possible structures
             if hasattr(response, 'text') and hasattr(response.text, 'content'):
                 return response.text.content
@@ -233,111 +599,23 @@ class LLMClient:
                 return response.content
             elif hasattr(response, 'message') and hasattr(response.message, 'content'):
                 return response.message.content
-            else:
-                # Check if this response contains only tool calls (no text content)
-                if hasattr(response, 'output') and response.output:
-                    has_tool_calls = any(hasattr(item, 'type') and item.type == 'function_call' for item in response.output)
-                    if has_tool_calls:
-                        return "I'm executing the requested tools to help you."
-                
-                # Last resort: convert to string and try to extract readable content
-                response_str = str(response)
-                self.logger.warning(f"Using string fallback for response parsing")
-                return response_str
+            
+            # This response contains only tool calls (no text content)
+            if tool_calls:
+                return "I'm executing the requested tools to help you."
+            
+            # Unknown shape: log only the output item types, not a repr of the whole response
+            logger.warning(
+                "Unrecognized response shape; output types=%s",
+                [getattr(item, 'type', None) for item in getattr(response, 'output', None) or ()]
+            )
+            return ""
                 
         except Exception as e:
-            self.logger.error(f"Could not extract content: {e}")
+            logger.error(f"Could not extract content: {e}")
             # Return a more helpful error message
             return f"Error extracting response content: {e}"
     
-    def _extract_reasoning(self, response) -> Optional[Dict]:
-        """Extract reasoning information from GPT-5-mini response"""
-        try:
-            # Check for reasoning in output array
-            if hasattr(response, 'output') and response.output:
-                for item in response.output:
-                    if hasattr(item, 'type') and item.type == 'reasoning':
-                        reasoning_data = {
-                            "available": True,
-                            "summary": None,
-                            "encrypted_content": getattr(item, 'encrypted_content', None)
-                        }
-                        
-                        # Extract summary if available
-                        if hasattr(item, 'summary') and item.summary:
-                            if isinstance(item.summary, list):
-                                # Combine all summary texts
-                                summary_texts = []
-                                for summary_item in item.summary:
-                                    if hasattr(summary_item, 'text'):
-                                        summary_texts.append(summary_item.text)
-                                reasoning_data["summary"] = "\n".join(summary_texts)
-                            else:
-                                reasoning_data["summary"] = str(item.summary)
-                        
-                        return reasoning_data
-            
-            # Fallback to direct reasoning attribute
-            if hasattr(response, 'reasoning'):
-                return {
-                    "available": True,
-                    "summary": getattr(response.reasoning, 'summary', None),
-                    "encrypted_content": getattr(response.reasoning, 'encrypted_content', None)
-                }
-            return None
-        except Exception as e:
-            self.logger.warning(f"Could not extract reasoning: {e}")
-            return None
-    
-    def _extract_tool_calls(self, response) -> List[Dict]:
-        """Extract tool calls from GPT-5-mini response"""
-        try:
-            tool_calls = []
-            
-            # GPT-5-mini responses structure: check for tool calls in output
-            if hasattr(response, 'output') and response.output:
-                for item in response.output:
-                    if hasattr(item, 'type'):
-                        # Look for function_call type (actual GPT-5-mini format)
-                        if item.type == 'function_call':
-                            # Direct function call in responses API
-                            arguments_str = getattr(item, 'arguments', '{}')
-                            try:
-                                # Parse JSON string arguments
-                                import json
-                                arguments = json.loads(arguments_str) if isinstance(arguments_str, str) else arguments_str
-                            except:
-                                arguments = arguments_str
-                            
-                            tool_calls.append({
-                                'id': getattr(item, 'call_id', getattr(item, 'id', '')),
-                                'name': getattr(item, 'name', ''),
-                                'arguments': arguments
-                            })
-                        # Legacy format: tool_calls array
-                        elif item.type == 'tool_calls' and hasattr(item, 'tool_calls'):
-                            for tool_call in item.tool_calls:
-                                if hasattr(tool_call, 'name'):
-                                    tool_calls.append({
-                                        'id': getattr(tool_call, 'id', ''),
-                                        'name': tool_call.name,
-                                        'arguments': getattr(tool_call, 'arguments', {})
-                                    })
-                                elif hasattr(tool_call, 'function'):
-                                    # Fallback to function format
-                                    tool_calls.append({
-                                        'id': getattr(tool_call, 'id', ''),
-                                        'name': tool_call.function.name,
-                                        'arguments': tool_call.function.arguments if hasattr(tool_call.function, 'arguments') else {}
-                                    })
-            
-            self.logger.info(f"Extracted {len(tool_calls)} tool calls from response")
-            return tool_calls
-            
-        except Exception as e:
-            self.logger.error(f"Could not extract tool calls: {e}")
-            return []
-    
     def _format_tool_calls_for_chat(self, tool_calls) -> List[Dict[str, Any]]:
         """Format tool calls from chat completions API to standard format"""
         formatted_calls = []
@@ -346,47 +624,158 @@ class LLMClient:
                 formatted_call = {
                     'id': tool_call.id,
                     'name': tool_call.function.name,
-                    'arguments': json.loads(tool_call.function.arguments) if isinstance(tool_call.function.arguments, str) else tool_call.function.arguments
+                    'arguments': fast_json.loads(tool_call.function.arguments) if isinstance(tool_call.function.arguments, str) else tool_call.function.arguments
                 }
                 formatted_calls.append(formatted_call)
             return formatted_calls
         except Exception as e:
-            self.logger.error(f"Could not format tool calls: {e}")
+            logger.error(f"Could not format tool calls: {e}")
             return []
     
     def score_paper(self, paper_info: str) -> Dict[str, Any]:
         """Score a paper using optimized GPT-5-mini configuration"""
-        messages = [
-            {
-                "role": "system",
-                "content": "You are an expert research paper evaluator for a 2D materials physics laboratory."
-            },
-            {
-                "role": "user", 
-                "content": f"Rate this paper from 1-3 based on relevance:\n\n{paper_info}\n\nRespond with: Score: X, Reason: [brief explanation]"
-            }
-        ]
+        return self.create_response(self._scoring_messages(paper_info), use_case="paper_scoring", cache=True)
+    
+    async def ascore_paper(self, paper_info: str) -> Dict[str, Any]:
+        """Async version of score_paper"""
+        return await self.acreate_response(self._scoring_messages(paper_info), use_case="paper_scoring", cache=True)
+    
+    async def ascore_papers(self, papers: List[str]) -> List[Dict[str, Any]]:
+        """Score several papers concurrently; results are returned in input order"""
+        return list(await asyncio.gather(*(self.ascore_paper(paper_info) for paper_info in papers)))
+    
+    def score_papers_batch(
+        self,
+        papers: List[str],
+        poll_interval: float = 30,
+        model: str = None,
+        timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Score papers through the Batch API, at half the price of real-time calls
+        
+        Blocks the calling thread, polling with time.sleep, until the batch finishes.
+        That can take up to the 24h completion window, so run it off the event loop
+        and UI threads. With a timeout (seconds), an unfinished batch is cancelled and
+        its papers get error results. Results are returned in input order, in the
+        same format as score_paper.
+        """
+        config = self._resolve_config("paper_scoring", None)
+        model_name = model or config.get("model", "gpt-4.1")
+        use_responses = model_name.startswith("gpt-5")
+        if use_responses:
+            endpoint, build_params = "/v1/responses", self._responses_params
+        else:
+            endpoint, build_params = "/v1/chat/completions", self._chat_completion_params
+        
+        try:
+            # One request per line, matched back to its paper by custom_id
+            requests_jsonl = "\n".join(
+                fast_json.dumps({
+                    "custom_id": f"paper-{i}",
+                    "method": "POST",
+                    "url": endpoint,
+                    "body": build_params(self._scoring_messages(paper_info), model_name, config)
+                })
+                for i, paper_info in enumerate(papers)
+            )
+            input_file = self.client.files.create(
+                file=("paper_scoring.jsonl", requests_jsonl.encode("utf-8")),
+                purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint=endpoint,
+                completion_window="24h"
+            )
+            logger.info(f"Submitted batch {batch.id} with {len(papers)} papers")
+            
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while batch.status not in _BATCH_TERMINAL_STATUSES:
+                if deadline is not None and time.monotonic() >= deadline:
+                    logger.warning(f"Batch {batch.id} not finished after {timeout}s, cancelling")
+                    self.client.batches.cancel(batch.id)
+                    return [self._batch_error(f"Batch timed out after {timeout}s") for _ in papers]
+                time.sleep(poll_interval if deadline is None else min(poll_interval, max(deadline - time.monotonic(), 0)))
+                batch = self.client.batches.retrieve(batch.id)
+            logger.info(f"Batch {batch.id} finished with status: {batch.status}")
+            
+            # One dict per paper, so changing one result does not change the others
+            missing = f"Batch {batch.status} without a result for this paper"
+            results = [self._batch_error(missing) for _ in papers]
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if not file_id:
+                    continue
+                for line in self.client.files.content(file_id).text.splitlines():
+                    if line:
+                        index, result = self._parse_batch_line(line, use_responses, model_name, config)
+                        results[index] = result
+            return results
+            
+        except Exception as e:
+            logger.error(f"Batch scoring error: {e}")
+            return [self._batch_error(str(e)) for _ in papers]
+    
+    def _parse_batch_line(self, line: str, use_responses: bool, model: str, config: Dict) -> Tuple[int, Dict[str, Any]]:
+        """Paper index and result for one line of a batch output or error file"""
+        from openai.types.chat import ChatCompletion
+        from openai.types.responses import Response
+        
+        record = fast_json.loads(line)
+        index = int(record["custom_id"].split("-", 1)[1])
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code") != 200:
+            return index, self._batch_error(str(record.get("error") or response.get("body")))
         
-        return self.create_response(messages, use_case="paper_scoring")
+        # Rebuild the SDK objects so the real-time parsers can be reused
+        if use_responses:
+            return index, self._responses_result(Response.model_validate(response["body"]), model, config)
+        return index, self._chat_completion_result(ChatCompletion.model_validate(response["body"]), model)
+    
+    @staticmethod
+    def _batch_error(error: str) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "error": error,
+            "content": "",
+            "metadata": {"error": "Batch API call failed"}
+        }
     
     def chat_about_papers(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
         """Chat about papers using enhanced reasoning configuration"""
         return self.create_response(messages, use_case="chat_conversation")
     
+    def astream_chat_about_papers(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """Streaming version of chat_about_papers, for UIs that render tokens as they arrive"""
+        return self.astream_response(messages, use_case="chat_conversation")
+    
     def analyze_research(self, analysis_prompt: str) -> Dict[str, Any]:
         """Perform deep research analysis with high reasoning effort"""
-        messages = [
+        return self.create_response(self._analysis_messages(analysis_prompt), use_case="research_analysis")
+    
+    async def aanalyze_research(self, analysis_prompt: str) -> Dict[str, Any]:
+        """Async version of analyze_research"""
+        return await self.acreate_response(self._analysis_messages(analysis_prompt), use_case="research_analysis")
+    
+    @staticmethod
+    def _scoring_messages(paper_info: str) -> List[Dict[str, str]]:
+        return [
+            _SCORING_SYSTEM_MESSAGE,
             {
-                "role": "system",
-                "content": "You are an expert research analyst specializing in condensed matter physics and 2D materials."
-            },
+                "role": "user", 
+                "content": f"Rate this paper from 1-3 based on relevance:\n\n{paper_info}\n\nRespond with: Score: X, Reason: [brief explanation]"
+            }
+        ]
+    
+    @staticmethod
+    def _analysis_messages(analysis_prompt: str) -> List[Dict[str, str]]:
+        return [
+            _ANALYSIS_SYSTEM_MESSAGE,
             {
                 "role": "user",
                 "content": analysis_prompt
             }
         ]
-        
-        return self.create_response(messages, use_case="research_analysis")
     
     def get_available_use_cases(self) -> List[str]:
         """Get list of available use case configurations"""
@@ -394,4 +783,33 @@ class LLMClient:
     
     def get_use_case_info(self, use_case: str) -> Optional[Dict]:
         """Get information about a specific use case configuration"""
-        return self.llm_config.get("use_cases", {}).get(use_case)
\ No newline at end of file
+        return self.llm_config.get("use_cases", {}).get(use_case)
+
+
+_shared_client: Optional[LLMClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    """Process-wide LLMClient. Prefer this over constructing LLMClient directly, so
+    callers share one set of connection pools instead of re-doing DNS and TLS setup.
+    
+    The client holds nothing bound to an event loop: its async client and semaphore are
+    created per running loop, so it can be shared by threads and by successive
+    asyncio.run calls."""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            # Checked again under the lock, so concurrent first calls build one client
+            if _shared_client is None:
+                _shared_client = LLMClient()
+    return _shared_client
+
+
+async def aget_llm_client() -> LLMClient:
+    """Async version of get_llm_client; the first call builds the client (config file
+    read and SDK setup) in a worker thread instead of on the event loop."""
+    if _shared_client is not None:
+        return _shared_client
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, get_llm_client)
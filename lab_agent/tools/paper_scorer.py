@@ -4,7 +4,7 @@ import json
 from typing import List, Dict
 from openai import OpenAI
 from ..utils import Config
-from .llm_client import LLMClient
+from .llm_client import get_llm_client
 
 
 class PaperScorer:
@@ -23,7 +23,7 @@ class PaperScorer:
         
         # Initialize GPT-5-mini client if needed
         if self.model_config.get('name') == 'gpt-5-mini':
-            self.llm_client = LLMClient()
+            self.llm_client = get_llm_client()
         else:
             self.llm_client = None
         
@@ -118,7 +118,8 @@ Subjects: {paper.get('subjects', 'N/A')}
                 result = self.llm_client.create_response(
                     messages=messages, 
                     use_case=self.model_config.get('purpose', 'paper_scoring'),
-                    model=self.model_config.get('name', 'gpt-5-mini')
+                    model=self.model_config.get('name', 'gpt-5-mini'),
+                    cache=True
                 )
                 
                 if result['success']:
@@ -0,0 +1,42 @@
+"""
+Fast JSON helpers - use orjson when it is installed, stdlib json otherwise.
+
+orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep
+catching json.JSONDecodeError regardless of which backend is active.
+"""
+
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from str, bytes or a bytes-like buffer such as a memoryview"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def dumps(obj: Any, sort_keys: bool = False, default: Optional[Callable[[Any], Any]] = None,
+          indent: bool = False) -> str:
+    """Serialize to a compact JSON string, or a 2-space indented one with indent=True"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=default, option=option).decode("utf-8")
+        except TypeError:
+            # orjson rejects e.g. integers wider than 64 bits; let json handle those
+            pass
+    if indent:
+        return json.dumps(obj, sort_keys=sort_keys, default=default, indent=2, ensure_ascii=False)
+    return json.dumps(obj, sort_keys=sort_keys, default=default, separators=(",", ":"))
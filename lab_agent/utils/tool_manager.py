@@ -8,16 +8,27 @@ from typing import Dict, List, Any
 from datetime import datetime
 
 
+_ACTIVATION_STATE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 
+    'config', 
+    'tool_activation_state.json'
+)
+
+
+def activation_state_version(config_path: str = None) -> int:
+    """Modification time of the activation state file; it changes whenever activations are saved"""
+    try:
+        return os.stat(config_path or _ACTIVATION_STATE_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
 class ToolManager:
     """Manages activation state of MCP tools"""
     
     def __init__(self, config_path: str = None):
         if config_path is None:
-            config_path = os.path.join(
-                os.path.dirname(os.path.dirname(__file__)), 
-                'config', 
-                'tool_activation_state.json'
-            )
+            config_path = _ACTIVATION_STATE_PATH
         self.config_path = config_path
         self.activation_state = self._load_activation_state()
     
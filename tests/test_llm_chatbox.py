@@ -0,0 +1,187 @@
+"""
+Tests for LLMChatbox tool result formatting, conversation history and trace logging
+"""
+
+import json
+import logging
+from collections import deque
+
+import pytest
+
+llm_chatbox = pytest.importorskip("lab_agent.tools.llm_chatbox")
+
+
+def _legacy_format(key, value):
+    """The if/elif chain that _FORMATTERS replaced, copied from the original
+    _format_tool_result_for_gpt loop body and kept as the reference output"""
+    content_parts = []
+    if key == 'high_priority_papers' and isinstance(value, list):
+        content_parts.append(f"\nHigh Priority Papers ({len(value)} papers):")
+        for i, paper in enumerate(value, 1):
+            if isinstance(paper, dict):
+                title = paper.get('title', 'N/A')
+                authors = paper.get('authors', 'N/A')
+                abstract = paper.get('abstract', 'N/A')[:200] + "..." if len(paper.get('abstract', '')) > 200 else paper.get('abstract', 'N/A')
+                reason = paper.get('ai_assessment', 'N/A')
+
+                content_parts.append(f"\n{i}. Title: {title}")
+                content_parts.append(f"   Authors: {authors}")
+                content_parts.append(f"   Abstract: {abstract}")
+                content_parts.append(f"   AI Assessment: {reason}")
+
+    elif key == 'search_results' and isinstance(value, dict):
+        # Handle search results from search_papers_by_author
+        matching_papers = value.get('matching_papers', [])
+        total_searched = value.get('total_papers_searched', 0)
+        content_parts.append("\nAuthor Search Results:")
+        content_parts.append(f"Papers searched: {total_searched}")
+        content_parts.append(f"Papers found: {len(matching_papers)}")
+
+        if matching_papers:
+            content_parts.append("\nMatching Papers:")
+            for i, paper in enumerate(matching_papers, 1):
+                if isinstance(paper, dict):
+                    title = paper.get('title', 'N/A')
+                    authors = paper.get('authors', 'N/A')
+                    abstract = paper.get('abstract', 'N/A')[:200] + "..." if len(paper.get('abstract', '')) > 200 else paper.get('abstract', 'N/A')
+                    priority = paper.get('priority', 'N/A')
+                    reason = paper.get('ai_assessment', 'N/A')
+
+                    content_parts.append(f"\n{i}. Title: {title}")
+                    content_parts.append(f"   Authors: {authors}")
+                    content_parts.append(f"   Priority: {priority}")
+                    content_parts.append(f"   Abstract: {abstract}")
+                    content_parts.append(f"   AI Assessment: {reason}")
+
+    elif key == 'search_query' and isinstance(value, dict):
+        # Handle search query info
+        author_name = value.get('author_name', 'N/A')
+        match_type = value.get('match_type', 'N/A')
+        date = value.get('date', 'N/A')
+        content_parts.append("\nSearch Query:")
+        content_parts.append(f"Author: {author_name}")
+        content_parts.append(f"Match Type: {match_type}")
+        content_parts.append(f"Report Date: {date}")
+
+    elif key == 'reports' and isinstance(value, list):
+        content_parts.append(f"\nAvailable Reports ({len(value)} reports):")
+        for report in value:
+            if isinstance(report, dict):
+                date = report.get('date', 'N/A')
+                total = report.get('total_papers', 0)
+                priority_3 = report.get('priority_3_count', 0)
+                content_parts.append(f"- {date}: {total} papers ({priority_3} high priority)")
+
+    elif key == 'summary' and isinstance(value, dict):
+        content_parts.append("\nSummary:")
+        for summary_key, summary_value in value.items():
+            formatted_key = summary_key.replace('_', ' ').title()
+            content_parts.append(f"- {formatted_key}: {summary_value}")
+
+    else:
+        # Generic formatting for other data types
+        if isinstance(value, (dict, list)):
+            content_parts.append(f"\n{key.replace('_', ' ').title()}: {str(value)}")
+        else:
+            content_parts.append(f"\n{key.replace('_', ' ').title()}: {value}")
+    return content_parts
+
+
+def _format(key, value):
+    return llm_chatbox._FORMATTERS.get(key, llm_chatbox._format_generic)(value, key)
+
+
+PAPER = {
+    "title": "Twisted bilayer graphene",
+    "authors": "A. Author, B. Author",
+    "abstract": "Moire " * 60,
+    "ai_assessment": "Highly relevant",
+    "priority": 3,
+}
+
+CASES = [
+    ("high_priority_papers", [PAPER, {"title": "No abstract"}, {"abstract": "Short."}, "not a paper"]),
+    ("high_priority_papers", []),
+    ("search_results", {"matching_papers": [PAPER, {"abstract": "x" * 200}], "total_papers_searched": 120}),
+    ("search_results", {"matching_papers": []}),
+    ("search_query", {"author_name": "Kim", "match_type": "partial", "date": "2025-01-02"}),
+    ("search_query", {}),
+    ("search_query", "Kim"),
+    ("reports", [{"date": "2025-01-02", "total_papers": 40, "priority_3_count": 5}, {}, 7]),
+    ("reports", "none"),
+    ("summary", {"total_papers": 40, "high_priority_count": 5}),
+    ("summary", None),
+    ("total_papers", 40),
+    ("date", "2025-01-02"),
+]
+
+# Values that reach the generic branch as containers, which are now emitted as JSON
+CONTAINER_CASES = [
+    ("high_priority_papers", {"not": "a list"}),
+    ("search_results", ["not", "a", "dict"]),
+    ("paper_ids", ["2501.00001", "2501.00002"]),
+    ("filters", {"category": "cond-mat", "min_priority": 2, "strict": True, "since": None}),
+]
+
+
+@pytest.mark.parametrize("key, value", CASES)
+def test_formatter_dispatch_matches_legacy_chain(key, value):
+    assert _format(key, value) == _legacy_format(key, value)
+
+
+@pytest.mark.parametrize("key, value", CONTAINER_CASES)
+def test_generic_containers_are_json_instead_of_repr(key, value):
+    title = key.replace('_', ' ').title()
+
+    assert _legacy_format(key, value) == [f"\n{title}: {str(value)}"]
+    assert _format(key, value) == [f"\n{title}: {json.dumps(value, separators=(',', ':'))}"]
+
+
+def _chatbox_with_history():
+    # Skips __init__, which loads config and connects the LLM and MCP clients
+    chatbox = llm_chatbox.LLMChatbox.__new__(llm_chatbox.LLMChatbox)
+    chatbox._system_msg = {"role": "system", "content": "You are helpful."}
+    chatbox._history = deque([
+        {"role": "user", "content": "Hi"},
+        {"role": "assistant", "content": "Hello"},
+    ])
+    chatbox._logged_count = 0
+    return chatbox
+
+
+def test_conversation_history_is_a_list_starting_with_system_message():
+    chatbox = _chatbox_with_history()
+
+    history = chatbox.conversation_history
+
+    assert isinstance(history, list)
+    assert [msg["role"] for msg in history] == ["system", "user", "assistant"]
+    assert history[-1:] == [{"role": "assistant", "content": "Hello"}]
+    # Callers get a copy, so changing it leaves the conversation alone
+    history.append({"role": "user", "content": "Again"})
+    assert len(chatbox.conversation_history) == 3
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.mark.parametrize("level, previews", [(logging.INFO, False), (logging.DEBUG, True)])
+def test_trace_previews_messages_only_at_debug(level, previews):
+    chatbox = _chatbox_with_history()
+    handler = _ListHandler()
+    chatbox.conversation_logger = logging.getLogger(f"test_conversation_trace.{level}")
+    chatbox.conversation_logger.setLevel(level)
+    chatbox.conversation_logger.propagate = False
+    chatbox.conversation_logger.addHandler(handler)
+
+    chatbox._log_conversation_state("test")
+
+    assert "Total messages: 3 (2 new)" in handler.messages
+    assert ("  [1] USER: Hi" in handler.messages) is previews
+    assert chatbox._logged_count == 2
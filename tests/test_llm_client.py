@@ -0,0 +1,136 @@
+"""
+Tests for the on-disk LLM response cache and the shared client
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+llm_client = pytest.importorskip("lab_agent.tools.llm_client")
+
+MESSAGES = [{"role": "user", "content": "Score this paper"}]
+CONFIG = {"model": "gpt-5", "reasoning": {"effort": "low", "summary": "auto"}}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_client.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return llm_client._ResponseCache(str(tmp_path / "cache" / "responses.sqlite"), ttl=60)
+
+
+def test_key_is_stable_across_dict_order():
+    reordered = {"reasoning": {"summary": "auto", "effort": "low"}, "model": "gpt-5"}
+
+    assert llm_client._ResponseCache.key("gpt-5", CONFIG, MESSAGES) == \
+        llm_client._ResponseCache.key("gpt-5", reordered, MESSAGES)
+
+
+@pytest.mark.parametrize("model, config, messages", [
+    ("gpt-4.1", CONFIG, MESSAGES),
+    ("gpt-5", {**CONFIG, "reasoning": {"effort": "high", "summary": "auto"}}, MESSAGES),
+    ("gpt-5", CONFIG, [{"role": "user", "content": "Score another paper"}]),
+])
+def test_key_changes_with_request(model, config, messages):
+    assert llm_client._ResponseCache.key(model, config, messages) != \
+        llm_client._ResponseCache.key("gpt-5", CONFIG, MESSAGES)
+
+
+def test_get_returns_stored_result(cache):
+    key = cache.key("gpt-5", CONFIG, MESSAGES)
+    result = {"success": True, "content": "Priority: 3"}
+
+    assert cache.get(key) is None
+    cache.set(key, result)
+
+    assert cache.get(key) == result
+
+
+def test_entries_expire_after_ttl(cache, clock):
+    key = cache.key("gpt-5", CONFIG, MESSAGES)
+    cache.set(key, {"success": True, "content": "Priority: 3"})
+
+    clock[0] += 59
+    assert cache.get(key) is not None
+    clock[0] += 1
+    assert cache.get(key) is None
+
+
+def test_set_refreshes_expiry(cache, clock):
+    key = cache.key("gpt-5", CONFIG, MESSAGES)
+    cache.set(key, {"success": True, "content": "old"})
+    clock[0] += 50
+    cache.set(key, {"success": True, "content": "new"})
+    clock[0] += 50
+
+    assert cache.get(key) == {"success": True, "content": "new"}
+
+
+def test_entries_persist_across_instances(tmp_path, clock):
+    path = str(tmp_path / "responses.sqlite")
+    key = llm_client._ResponseCache.key("gpt-5", CONFIG, MESSAGES)
+    llm_client._ResponseCache(path, ttl=60).set(key, {"success": True, "content": "Priority: 2"})
+
+    assert llm_client._ResponseCache(path, ttl=60).get(key) == {"success": True, "content": "Priority: 2"}
+
+
+class _LoopBoundAsyncOpenAI:
+    """Stands in for AsyncOpenAI; like its connection pool, it only works on the loop it was created on"""
+
+    def __init__(self, **kwargs):
+        self.loop = asyncio.get_running_loop()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **params):
+        if asyncio.get_running_loop() is not self.loop:
+            raise RuntimeError("Event loop is closed")
+        message = SimpleNamespace(content="ok", tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def test_shared_client_works_across_event_loops(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(llm_client, "AsyncOpenAI", _LoopBoundAsyncOpenAI)
+    monkeypatch.setattr(llm_client, "_shared_client", None)
+    client = llm_client.get_llm_client()
+
+    # Each call runs on a new loop, as the web app does per chat message
+    first = asyncio.run(client.acreate_response(MESSAGES, model="gpt-4.1"))
+    second = asyncio.run(client.acreate_response(MESSAGES, model="gpt-4.1"))
+
+    assert first["success"] is True, first
+    assert second["success"] is True, second
+    assert llm_client.get_llm_client() is client
+    # The client of the finished first loop is dropped when the second loop creates its own
+    assert len(client._loop_resources) == 1
+
+
+def test_response_cache_is_opened_on_first_cached_request(tmp_path, monkeypatch):
+    path = tmp_path / "cache" / "responses.sqlite"
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(llm_client, "_RESPONSE_CACHE_PATH", str(path))
+    calls = []
+
+    def create(**params):
+        calls.append(params)
+        message = SimpleNamespace(content="Priority: 3", tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+    client = llm_client.LLMClient()
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    client.create_response(MESSAGES, model="gpt-4.1")
+    assert not path.exists()
+
+    first = client.create_response(MESSAGES, model="gpt-4.1", cache=True)
+    second = client.create_response(MESSAGES, model="gpt-4.1", cache=True)
+
+    assert path.exists()
+    assert first == second
+    assert len(calls) == 2
@@ -0,0 +1,233 @@
+"""
+Tests for ToolLoop tool memoization, message windowing and tool timeouts
+"""
+
+import time
+
+import pytest
+
+tool_loop = pytest.importorskip("lab_agent.playground.tool_loop")
+
+
+def _tool(name, memoizable=False):
+    function = {"name": name, "description": "", "parameters": {"type": "object", "properties": {}}}
+    if memoizable:
+        function["memoizable"] = True
+    return {"type": "function", "function": function}
+
+
+def _call(name, arguments):
+    return {"function": {"name": name, "arguments": arguments}}
+
+
+class _Executor:
+    """Tool executor that records calls and returns queued results"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    def __call__(self, tool_name, arguments, tool_def):
+        self.calls.append((tool_name, arguments))
+        result = self.results.pop(0) if self.results else {"success": True, "result": len(self.calls)}
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.fixture
+def loop():
+    # Any non-None client keeps ToolLoop from constructing a real ResponsesClient
+    return tool_loop.ToolLoop(responses_client=object())
+
+
+def test_memo_hit_skips_executor(loop):
+    index = loop._build_tool_index([_tool("lookup", memoizable=True)])
+    executor = _Executor()
+
+    first = loop._execute_single_tool(_call("lookup", '{"b": 2, "a": 1}'), executor, index)
+    # Same arguments in a different key order hit the same entry
+    second = loop._execute_single_tool(_call("lookup", {"a": 1, "b": 2}), executor, index)
+
+    assert len(executor.calls) == 1
+    assert second.result == first.result
+    assert second.result_json == first.result_json
+
+
+def test_memo_hit_returns_copy(loop):
+    index = loop._build_tool_index([_tool("lookup", memoizable=True)])
+    executor = _Executor({"success": True, "result": {"items": [1]}})
+
+    first = loop._execute_single_tool(_call("lookup", {}), executor, index)
+    first.result["result"]["items"].append(2)
+    second = loop._execute_single_tool(_call("lookup", {}), executor, index)
+
+    assert second.result["result"]["items"] == [1]
+
+
+def test_memo_miss_on_different_arguments(loop):
+    index = loop._build_tool_index([_tool("lookup", memoizable=True)])
+    executor = _Executor()
+
+    loop._execute_single_tool(_call("lookup", {"a": 1}), executor, index)
+    loop._execute_single_tool(_call("lookup", {"a": 2}), executor, index)
+
+    assert executor.calls == [("lookup", {"a": 1}), ("lookup", {"a": 2})]
+
+
+def test_tools_without_flag_are_not_memoized(loop):
+    index = loop._build_tool_index([_tool("lookup")])
+    executor = _Executor()
+
+    loop._execute_single_tool(_call("lookup", {}), executor, index)
+    loop._execute_single_tool(_call("lookup", {}), executor, index)
+
+    assert len(executor.calls) == 2
+    assert loop._memo == {}
+
+
+@pytest.mark.parametrize("failure", [
+    {"success": False, "error": "not found"},
+    RuntimeError("boom"),
+])
+def test_failures_are_not_stored(loop, failure):
+    index = loop._build_tool_index([_tool("lookup", memoizable=True)])
+    executor = _Executor(failure, {"success": True, "result": "ok"})
+
+    failed = loop._execute_single_tool(_call("lookup", {}), executor, index)
+    retried = loop._execute_single_tool(_call("lookup", {}), executor, index)
+
+    assert failed.result["success"] is False
+    assert retried.result == {"success": True, "result": "ok"}
+    assert len(executor.calls) == 2
+
+
+def test_clear_memo_cache(loop):
+    index = loop._build_tool_index([_tool("lookup", memoizable=True)])
+    executor = _Executor()
+
+    loop._execute_single_tool(_call("lookup", {}), executor, index)
+    loop.clear_memo_cache()
+    loop._execute_single_tool(_call("lookup", {}), executor, index)
+
+    assert len(executor.calls) == 2
+
+
+def _conversation(turns):
+    messages = [{"role": "system", "content": "You are helpful."}]
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"question {i}"})
+        messages.append({"role": "assistant", "content": f"answer {i}"})
+    return messages
+
+
+def test_short_conversation_is_sent_unchanged(loop):
+    messages = _conversation(5)
+
+    assert loop._window_messages(messages) is messages
+
+
+def test_window_keeps_system_message_and_tail(loop):
+    loop.set_context_window(10, keep_tail=4)
+    messages = _conversation(10)
+
+    windowed = loop._window_messages(messages)
+
+    assert windowed[0] is messages[0]
+    assert windowed[-4:] == messages[-4:]
+    assert len(windowed) == 6
+    summary = windowed[1]
+    assert summary["role"] == "system"
+    assert summary["content"].startswith("Earlier conversation (16 messages, condensed):")
+    assert "[user] question 0" in summary["content"]
+    assert "[assistant] answer 7" in summary["content"]
+    assert "question 8" not in summary["content"]
+
+
+def test_window_truncates_condensed_content(loop):
+    loop.set_context_window(4, keep_tail=2)
+    loop.condensed_content_chars = 10
+    messages = _conversation(3)
+    messages[1]["content"] = "x" * 50
+
+    summary = loop._window_messages(messages)[1]["content"]
+
+    assert "[user] " + "x" * 10 + "..." in summary
+    assert "x" * 11 not in summary
+
+
+def test_window_tail_does_not_start_with_tool_result(loop):
+    loop.set_context_window(6, keep_tail=2)
+    messages = _conversation(3) + [
+        {"role": "assistant", "content": "", "tool_calls": [{"id": "call_1"}]},
+        {"role": "tool", "tool_call_id": "call_1", "content": "result"},
+        {"role": "tool", "tool_call_id": "call_2", "content": "result"},
+    ]
+
+    windowed = loop._window_messages(messages)
+
+    # The tail is widened back to the assistant turn that requested the tools
+    assert windowed[-3:] == messages[-3:]
+    assert windowed[-3]["role"] == "assistant"
+
+
+class _ScriptedResponses:
+    """Responses client that requests the queued tool calls, then replies with text"""
+
+    def __init__(self, *turns):
+        self.turns = list(turns)
+
+    def create_response(self, **kwargs):
+        return self.turns.pop(0) if self.turns else []
+
+    def extract_tool_calls(self, response):
+        return response
+
+    def extract_text_content(self, response):
+        return "" if response else "done"
+
+
+def _sleeping_executor(started):
+    def execute(tool_name, arguments, tool_def):
+        started.append(tool_name)
+        time.sleep(arguments["seconds"])
+        return {"success": True}
+    return execute
+
+
+def _timed_calls(*seconds):
+    return [
+        {"id": f"call_{i}", "function": {"name": f"tool_{i}", "arguments": {"seconds": s}}}
+        for i, s in enumerate(seconds)
+    ]
+
+
+def test_tool_timeout_is_one_deadline_per_batch():
+    calls = _timed_calls(0.5, 0.5, 0.5)
+    loop = tool_loop.ToolLoop(responses_client=_ScriptedResponses(calls))
+    loop.set_tool_timeout(0.1)
+    tools = [_tool(call["function"]["name"]) for call in calls]
+
+    start = time.monotonic()
+    result = loop.execute_tool_loop("gpt-5", [], tools, _sleeping_executor([]))
+    elapsed = time.monotonic() - start
+
+    assert result["success"] is True
+    assert [entry.get("error") for entry in result["tool_calls"]] == \
+        ["Tool execution timed out after 0.1 seconds"] * 3
+    # Waiting on each tool in turn would take three timeouts
+    assert elapsed < 0.3
+
+
+def test_queued_tools_past_deadline_do_not_run():
+    calls = _timed_calls(0.3, 0)
+    loop = tool_loop.ToolLoop(responses_client=_ScriptedResponses(calls))
+    loop.set_tool_timeout(0.1)
+    loop.set_max_parallel_tools(1)
+    tools = [_tool(call["function"]["name"]) for call in calls]
+    started = []
+
+    loop.execute_tool_loop("gpt-5", [], tools, _sleeping_executor(started))
+    time.sleep(0.4)
+
+    assert started == ["tool_0"]